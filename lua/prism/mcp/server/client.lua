@@ -175,8 +175,10 @@ function M.send(client, message, callback)
     return
   end
 
-  local text_frame = frame.create_text_frame(message)
-  client.tcp_handle:write(text_frame, callback)
+  -- Vectored write: header and payload go out together without building
+  -- a concatenated copy of the (possibly large) JSON-RPC message
+  local header = frame.encode_header(frame.OPCODE.TEXT, #message)
+  client.tcp_handle:write({ header, message }, callback)
 end
 
 --- Send a ping to a client
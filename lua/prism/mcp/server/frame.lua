@@ -216,6 +216,27 @@ function M.encode(opcode, payload, fin, masked)
   return table.concat(frame_data)
 end
 
+--- Encode only the header of an unmasked frame
+--- Lets callers pass { header, payload } to a vectored write instead of
+--- copying the payload into a freshly concatenated frame string.
+--- @param opcode number Frame opcode
+--- @param payload_len number Payload length in bytes
+--- @param fin boolean|nil Final fragment flag (default: true)
+--- @return string header Encoded frame header
+function M.encode_header(opcode, payload_len, fin)
+  local byte1 = opcode
+  if fin ~= false then
+    byte1 = bit.bor(byte1, 0x80) -- Set FIN bit
+  end
+
+  if payload_len < 126 then
+    return string.char(byte1, payload_len)
+  elseif payload_len < 65536 then
+    return string.char(byte1, 126) .. utils.uint16_to_bytes(payload_len)
+  end
+  return string.char(byte1, 127) .. utils.uint64_to_bytes(payload_len)
+end
+
 --- Create a text frame
 --- @param text string Text to send
 --- @param fin boolean|nil Final fragment flag (default: true)
@@ -259,6 +259,17 @@ if vim.fn.has("nvim") == 1 then
   -- Register socket in the registry (so MCP can find us via process tree)
   local registry_path = "/tmp/prism-socket-registry.json"
 
+  -- Write via a temp file + rename so readers never see a partial registry
+  local function write_registry(registry)
+    local tmp_path = registry_path .. "." .. nvim_pid .. ".tmp"
+    local f = io.open(tmp_path, "w")
+    if f then
+      f:write(vim.json.encode(registry))
+      f:close()
+      os.rename(tmp_path, registry_path)
+    end
+  end
+
   local function register_socket()
     local registry = {}
 
@@ -281,12 +292,7 @@ if vim.fn.has("nvim") == 1 then
       registered_at = os.time(),
     }
 
-    -- Write back
-    f = io.open(registry_path, "w")
-    if f then
-      f:write(vim.json.encode(registry))
-      f:close()
-    end
+    write_registry(registry)
   end
 
   local function unregister_socket()
@@ -302,12 +308,7 @@ if vim.fn.has("nvim") == 1 then
     end
 
     registry[tostring(nvim_pid)] = nil
-
-    f = io.open(registry_path, "w")
-    if f then
-      f:write(vim.json.encode(registry))
-      f:close()
-    end
+    write_registry(registry)
   end
 
   -- Register on startup
@@ -349,11 +350,7 @@ if vim.fn.has("nvim") == 1 then
             parent_nvim = nvim_pid,
           }
 
-          f = io.open(registry_path, "w")
-          if f then
-            f:write(vim.json.encode(registry))
-            f:close()
-          end
+          write_registry(registry)
         end
       end, 100)
     end
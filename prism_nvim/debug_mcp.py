@@ -10,6 +10,9 @@ import time
 
 LOG_FILE = "/tmp/prism-mcp-debug.log"
 
+# Read unit for relaying stdio; large reads keep syscalls per message low
+CHUNK_SIZE = 65536
+
 
 def log(msg):
     with open(LOG_FILE, "a") as f:
@@ -17,6 +20,17 @@ def log(msg):
         f.flush()
 
 
+def log_frames(label, pending, data):
+    """Log each complete newline-delimited message in data.
+
+    Partial messages are kept in pending until their newline arrives.
+    """
+    pending += data
+    while (nl := pending.find(b"\n")) != -1:
+        log(f"{label}: {bytes(pending[:nl])!r}")
+        del pending[: nl + 1]
+
+
 def main():
     log("=== DEBUG MCP WRAPPER STARTED ===")
     log(f"NVIM={os.environ.get('NVIM', 'not set')}")
@@ -29,54 +43,54 @@ def main():
         stderr=subprocess.PIPE,
     )
 
-    def forward_stdin():
-        """Forward stdin to the subprocess, logging everything."""
-        try:
-            while True:
-                data = sys.stdin.buffer.read(1)
-                if not data:
-                    log("STDIN: EOF")
-                    proc.stdin.close()
-                    break
-                log(f"STDIN: {repr(data)}")
-                proc.stdin.write(data)
-                proc.stdin.flush()
-        except Exception as e:
-            log(f"STDIN ERROR: {e}")
-
-    def forward_stdout():
-        """Forward subprocess stdout to our stdout, logging everything."""
-        try:
-            while True:
-                data = proc.stdout.read(1)
-                if not data:
-                    log("STDOUT: EOF from server")
-                    break
-                log(f"STDOUT: {repr(data)}")
-                sys.stdout.buffer.write(data)
-                sys.stdout.buffer.flush()
-        except Exception as e:
-            log(f"STDOUT ERROR: {e}")
+    def relay(label, src_fd, dst, eof_msg, on_eof=None):
+        """Copy src_fd to dst (None: log only) until EOF.
 
-    def forward_stderr():
-        """Log stderr from subprocess."""
+        One thread per stream: a blocking write here can never stall the
+        reads of another stream, so a large request going in can't deadlock
+        against a large response coming out.
+        """
+        pending = bytearray()
+        # Reads land in one preallocated buffer; only the log framer copies out
+        readbuf = memoryview(bytearray(CHUNK_SIZE))
         try:
-            for line in proc.stderr:
-                log(f"STDERR: {line}")
+            while n := os.readv(src_fd, [readbuf]):
+                data = readbuf[:n]
+                if dst is not None:
+                    dst.write(data)
+                    dst.flush()
+                log_frames(label, pending, data)
+            log(f"{label}: {eof_msg}")
+            if on_eof:
+                on_eof()
         except Exception as e:
-            log(f"STDERR ERROR: {e}")
-
-    # Start forwarding threads
-    stdin_thread = threading.Thread(target=forward_stdin, daemon=True)
-    stdout_thread = threading.Thread(target=forward_stdout, daemon=True)
-    stderr_thread = threading.Thread(target=forward_stderr, daemon=True)
+            log(f"{label} ERROR: {e}")
 
-    stdin_thread.start()
-    stdout_thread.start()
-    stderr_thread.start()
+    threads = [
+        threading.Thread(
+            target=relay,
+            args=("STDIN", sys.stdin.fileno(), proc.stdin, "EOF", proc.stdin.close),
+            daemon=True,
+        ),
+        threading.Thread(
+            target=relay,
+            args=("STDOUT", proc.stdout.fileno(), sys.stdout.buffer, "EOF from server"),
+            daemon=True,
+        ),
+        threading.Thread(
+            target=relay,
+            args=("STDERR", proc.stderr.fileno(), None, "EOF from server"),
+            daemon=True,
+        ),
+    ]
+    for thread in threads:
+        thread.start()
 
     # Wait for process to finish
     proc.wait()
+    # Drain whatever the server wrote before exiting
+    for thread in threads[1:]:
+        thread.join()
     log(f"Server exited with code {proc.returncode}")
 
 
@@ -8,11 +8,20 @@ Uses the official MCP SDK for proper protocol handling.
 """
 
 import asyncio
+import atexit
+import functools
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import re
+import subprocess
+import time
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
-from typing import Callable, Optional
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
 
 from mcp.server import InitializationOptions, Server
 from mcp.server.stdio import stdio_server
@@ -21,6 +30,14 @@ from mcp.types import Tool as MCPTool
 
 from .nvim_client import NeovimClient
 
+# orjson is an optional speedup for encoding tool results
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Tools to HIDE from tools/list (still callable via advanced gateway)
 # Goal: Expose only ~20 essential tools to save context tokens
 HIDDEN_TOOLS = {
@@ -107,6 +124,47 @@ HIDDEN_TOOLS = {
     "spectre_word",
 }
 
+# Tools whose results depend only on editor state. Their formatted output is
+# cached briefly and dropped whenever any other tool runs. Hidden tools are
+# left out: they are only reachable through "advanced", which clears the cache.
+READ_ONLY_TOOLS = frozenset(
+    {
+        "get_diagnostics",
+        "git_status",
+        "git_diff",
+    }
+)
+
+# Idempotent tools agents tend to fire in quick bursts while narrowing in:
+# a repeat of the previous call with identical arguments inside the window
+# (seconds) returns the previous result instead of touching the editor again.
+# Only directly callable tools belong here; hidden ones go through "advanced".
+DEBOUNCE_TOOLS = MappingProxyType(
+    {
+        "search_in_file": 0.05,
+    }
+)
+
+# Name of a buffer if it is still valid and listed, else nil
+_LISTED_BUF_NAME_LUA = """
+local buf = ...
+if vim.api.nvim_buf_is_valid(buf) and vim.bo[buf].buflisted then
+    return vim.api.nvim_buf_get_name(buf)
+end
+return nil
+"""
+
+# {bufnr, name} pairs for all listed buffers, in one round trip
+_LISTED_BUFS_LUA = """
+local result = {}
+for _, buf in ipairs(vim.api.nvim_list_bufs()) do
+    if vim.bo[buf].buflisted then
+        table.insert(result, { buf, vim.api.nvim_buf_get_name(buf) })
+    end
+end
+return result
+"""
+
 
 def _path_matches(buf_name: str, path: str) -> bool:
     """Check if a buffer name matches a path.
@@ -125,6 +183,28 @@ def _path_matches(buf_name: str, path: str) -> bool:
     return False
 
 
+@functools.lru_cache(maxsize=1024)
+def _norm_path(path: str) -> str:
+    """Expand ``~`` and collapse redundant separators (memoized).
+
+    Deliberately not ``abspath``: relative paths are resolved against
+    Neovim's cwd, not ours, and bare names must still suffix-match.
+    """
+    if not path:
+        return path
+    return os.path.normpath(os.path.expanduser(path))
+
+
+def _cache_key(name: str, arguments: dict) -> Optional[tuple]:
+    """Build a hashable cache key for a tool call (None if args are unhashable)."""
+    key = (name, tuple(sorted(arguments.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 class BytesEncoder(json.JSONEncoder):
     """Custom JSON encoder that handles bytes and dataclasses."""
 
@@ -136,6 +216,20 @@ class BytesEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _to_json(obj) -> str:
+    """Encode a tool result as compact JSON, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, cls=BytesEncoder, separators=(",", ":"))
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -145,10 +239,842 @@ class ToolDef:
 
     name: str
     description: str
-    input_schema: dict
+    input_schema: Mapping
     handler: Callable
 
 
+# =============================================================================
+# Tool input schemas
+# =============================================================================
+# Built once at import time and shared by every server instance.
+
+_SCHEMA_NO_ARGS = MappingProxyType({"type": "object", "properties": {}})
+
+_SCHEMA_OPEN_FILE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "Path to the file to open (absolute or relative to cwd)",
+            },
+            "line": {
+                "type": "integer",
+                "description": "Line number to jump to after opening (1-indexed)",
+            },
+            "column": {
+                "type": "integer",
+                "description": "Column number to jump to after opening (1-indexed)",
+            },
+            "keep_focus": {
+                "type": "boolean",
+                "description": "Return focus to terminal after opening (default: true)",
+                "default": True,
+            },
+        },
+        "required": ["path"],
+    }
+)
+
+_SCHEMA_SAVE_FILE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "Optional new path to save to (save as)",
+            }
+        },
+    }
+)
+
+_SCHEMA_CLOSE_FILE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "Path of file to close (current buffer if not specified)",
+            },
+            "force": {
+                "type": "boolean",
+                "description": "Force close without saving changes",
+                "default": False,
+            },
+        },
+    }
+)
+
+_SCHEMA_CREATE_FILE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "Path for the new file"},
+            "content": {
+                "type": "string",
+                "description": "Initial content for the file",
+                "default": "",
+            },
+        },
+        "required": ["path"],
+    }
+)
+
+_SCHEMA_GET_BUFFER_CONTENT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "Path of file to read (current buffer if not specified)",
+            }
+        },
+    }
+)
+
+_SCHEMA_GET_BUFFER_LINES = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "Path of file (current buffer if not specified)",
+            },
+            "start_line": {
+                "type": "integer",
+                "description": "Start line (1-indexed)",
+                "default": 1,
+            },
+            "end_line": {
+                "type": "integer",
+                "description": "End line (inclusive, -1 for end of file)",
+                "default": -1,
+            },
+        },
+    }
+)
+
+_SCHEMA_SET_BUFFER_CONTENT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "content": {"type": "string", "description": "New content for the buffer"},
+            "path": {
+                "type": "string",
+                "description": "Path of file (current buffer if not specified)",
+            },
+            "auto_save": {
+                "type": "boolean",
+                "description": "Automatically save after edit (default: false)",
+                "default": False,
+            },
+        },
+        "required": ["content"],
+    }
+)
+
+_SCHEMA_EDIT_BUFFER = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "start_line": {
+                "type": "integer",
+                "description": "Start line to replace (1-indexed)",
+            },
+            "end_line": {
+                "type": "integer",
+                "description": "End line to replace (inclusive)",
+            },
+            "new_lines": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "New lines to insert",
+            },
+            "path": {
+                "type": "string",
+                "description": "Path of file (current buffer if not specified)",
+            },
+            "auto_save": {
+                "type": "boolean",
+                "description": "Automatically save after edit (default: false)",
+                "default": False,
+            },
+        },
+        "required": ["start_line", "end_line", "new_lines"],
+    }
+)
+
+_SCHEMA_INSERT_TEXT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "line": {"type": "integer", "description": "Line number (1-indexed)"},
+            "column": {"type": "integer", "description": "Column number (0-indexed)"},
+            "text": {"type": "string", "description": "Text to insert"},
+            "path": {
+                "type": "string",
+                "description": "Path of file (current buffer if not specified)",
+            },
+        },
+        "required": ["line", "column", "text"],
+    }
+)
+
+_SCHEMA_SET_CURSOR_POSITION = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "line": {"type": "integer", "description": "Line number (1-indexed)"},
+            "column": {"type": "integer", "description": "Column number (0-indexed)"},
+            "wait": {
+                "type": "boolean",
+                "description": (
+                    "Wait for Neovim to confirm the move (default: true); "
+                    "false sends it one-way and cannot report errors"
+                ),
+            },
+        },
+        "required": ["line", "column"],
+    }
+)
+
+_SCHEMA_SPLIT_WINDOW = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "vertical": {
+                "type": "boolean",
+                "description": "Create vertical split (side by side)",
+                "default": False,
+            },
+            "path": {"type": "string", "description": "File to open in new split"},
+        },
+    }
+)
+
+_SCHEMA_CLOSE_WINDOW = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "force": {"type": "boolean", "description": "Force close", "default": False}
+        },
+    }
+)
+
+_SCHEMA_GET_DIAGNOSTICS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "Path of file (current buffer if not specified)",
+            }
+        },
+    }
+)
+
+_SCHEMA_SEARCH_IN_FILE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "pattern": {
+                "type": "string",
+                "description": (
+                    "Search pattern (Python regular expression; the first match "
+                    "is also highlighted with a Vim /search)"
+                ),
+            }
+        },
+        "required": ["pattern"],
+    }
+)
+
+_SCHEMA_SEARCH_AND_REPLACE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "pattern": {"type": "string", "description": "Search pattern"},
+            "replacement": {"type": "string", "description": "Replacement text"},
+            "flags": {
+                "type": "string",
+                "description": "Flags: g (global), i (ignore case), c (confirm)",
+                "default": "g",
+            },
+        },
+        "required": ["pattern", "replacement"],
+    }
+)
+
+_SCHEMA_GIT_DIFF = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "staged": {
+                "type": "boolean",
+                "description": "Show staged changes only",
+                "default": False,
+            }
+        },
+    }
+)
+
+_SCHEMA_GIT_STAGE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "File path to stage (current file if not specified)",
+            },
+            "all": {
+                "type": "boolean",
+                "description": "Stage all changes (git add -A)",
+                "default": False,
+            },
+        },
+    }
+)
+
+_SCHEMA_GIT_COMMIT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "message": {
+                "type": "string",
+                "description": "Commit message (required)",
+            }
+        },
+        "required": ["message"],
+    }
+)
+
+_SCHEMA_GIT_BLAME = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "line": {
+                "type": "integer",
+                "description": "Line number (current line if not specified)",
+            }
+        },
+    }
+)
+
+_SCHEMA_GIT_LOG = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "description": "Number of commits to show",
+                "default": 10,
+            },
+            "path": {
+                "type": "string",
+                "description": "Filter to commits affecting this path",
+            },
+        },
+    }
+)
+
+_SCHEMA_GOTO_LINE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "line": {"type": "integer", "description": "Line number (1-indexed)"},
+            "path": {
+                "type": "string",
+                "description": "File path (default: current buffer)",
+            },
+        },
+        "required": ["line"],
+    }
+)
+
+_SCHEMA_GOTO_MATCHING = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "File path (default: current buffer)",
+            },
+        },
+    }
+)
+
+_SCHEMA_DIAGNOSTIC_JUMP = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "severity": {
+                "type": "string",
+                "description": "Filter by severity: error, warning, info, hint",
+            },
+            "path": {
+                "type": "string",
+                "description": "File path (default: current buffer)",
+            },
+        },
+    }
+)
+
+_SCHEMA_JUMP_BACK = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "description": "Number of jumps back",
+                "default": 1,
+            }
+        },
+    }
+)
+
+_SCHEMA_JUMP_FORWARD = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "description": "Number of jumps forward",
+                "default": 1,
+            }
+        },
+    }
+)
+
+_SCHEMA_UNDO = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "description": "Number of changes to undo",
+                "default": 1,
+            },
+            "path": {
+                "type": "string",
+                "description": "File path (default: current buffer)",
+            },
+        },
+    }
+)
+
+_SCHEMA_REDO = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "description": "Number of changes to redo",
+                "default": 1,
+            },
+            "path": {
+                "type": "string",
+                "description": "File path (default: current buffer)",
+            },
+        },
+    }
+)
+
+_SCHEMA_RENAME_SYMBOL = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "new_name": {"type": "string", "description": "New name for the symbol"}
+        },
+        "required": ["new_name"],
+    }
+)
+
+_SCHEMA_CODE_ACTIONS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "apply_first": {
+                "type": "boolean",
+                "description": "Automatically apply the first action",
+                "default": False,
+            }
+        },
+    }
+)
+
+_SCHEMA_GOTO_SYMBOL = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "description": "Symbol name to find"},
+            "kind": {
+                "type": "string",
+                "description": "Symbol kind filter (function, class, method, etc.)",
+            },
+        },
+        "required": ["name"],
+    }
+)
+
+_SCHEMA_FOLD = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "line": {
+                "type": "integer",
+                "description": "Line to fold (cursor if not specified)",
+            },
+            "all": {
+                "type": "boolean",
+                "description": "Fold all foldable regions",
+                "default": False,
+            },
+        },
+    }
+)
+
+_SCHEMA_UNFOLD = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "line": {
+                "type": "integer",
+                "description": "Line to unfold (cursor if not specified)",
+            },
+            "all": {
+                "type": "boolean",
+                "description": "Unfold all regions",
+                "default": False,
+            },
+        },
+    }
+)
+
+_SCHEMA_BOOKMARK = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "description": "Name for the bookmark"},
+            "description": {"type": "string", "description": "Optional description"},
+        },
+        "required": ["name"],
+    }
+)
+
+_SCHEMA_GOTO_BOOKMARK = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {"name": {"type": "string", "description": "Bookmark name"}},
+        "required": ["name"],
+    }
+)
+
+_SCHEMA_DELETE_BOOKMARK = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "description": "Bookmark name to delete"}
+        },
+        "required": ["name"],
+    }
+)
+
+_SCHEMA_LINE_RANGE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "start_line": {
+                "type": "integer",
+                "description": "Start line (current if not specified)",
+            },
+            "end_line": {
+                "type": "integer",
+                "description": "End line (same as start if not specified)",
+            },
+        },
+    }
+)
+
+_SCHEMA_DUPLICATE_LINE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "line": {
+                "type": "integer",
+                "description": "Line to duplicate (current if not specified)",
+            },
+            "count": {"type": "integer", "description": "Number of copies", "default": 1},
+        },
+    }
+)
+
+_SCHEMA_MOVE_LINE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "direction": {
+                "type": "string",
+                "enum": ["up", "down"],
+                "description": "Direction to move",
+            },
+            "start_line": {
+                "type": "integer",
+                "description": "Start line (current if not specified)",
+            },
+            "end_line": {"type": "integer", "description": "End line for range move"},
+        },
+        "required": ["direction"],
+    }
+)
+
+_SCHEMA_JOIN_LINES = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "description": "Number of lines to join",
+                "default": 2,
+            }
+        },
+    }
+)
+
+_SCHEMA_SELECT_BLOCK = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "type": {
+                "type": "string",
+                "description": "Block type: braces, brackets, parens, quotes",
+                "default": "braces",
+            },
+            "around": {
+                "type": "boolean",
+                "description": "Include the delimiters",
+                "default": False,
+            },
+        },
+    }
+)
+
+_SCHEMA_INDENT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "start_line": {
+                "type": "integer",
+                "description": "Start line (current if not specified)",
+            },
+            "end_line": {
+                "type": "integer",
+                "description": "End line (same as start if not specified)",
+            },
+            "count": {"type": "integer", "description": "Indent levels", "default": 1},
+        },
+    }
+)
+
+_SCHEMA_DEDENT = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "start_line": {
+                "type": "integer",
+                "description": "Start line (current if not specified)",
+            },
+            "end_line": {
+                "type": "integer",
+                "description": "End line (same as start if not specified)",
+            },
+            "count": {"type": "integer", "description": "Dedent levels", "default": 1},
+        },
+    }
+)
+
+_SCHEMA_OPEN_TERMINAL = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "split": {
+                "type": "string",
+                "enum": ["horizontal", "vertical", "tab"],
+                "description": "How to open the terminal",
+                "default": "horizontal",
+            }
+        },
+    }
+)
+
+_SCHEMA_RUN_COMMAND = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "command": {"type": "string", "description": "The ex command to execute"}
+        },
+        "required": ["command"],
+    }
+)
+
+_SCHEMA_NOTIFY = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "message": {"type": "string", "description": "Message to display"},
+            "level": {
+                "type": "string",
+                "enum": ["info", "warn", "error"],
+                "description": "Notification level",
+                "default": "info",
+            },
+        },
+        "required": ["message"],
+    }
+)
+
+_SCHEMA_DIFF_PREVIEW = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "Path to file"},
+            "new_content": {"type": "string", "description": "Proposed new content"},
+        },
+        "required": ["path", "new_content"],
+    }
+)
+
+_SCHEMA_SET_CONFIG = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "auto_save": {
+                "type": "boolean",
+                "description": "Auto-save after edits",
+            },
+            "keep_focus": {
+                "type": "boolean",
+                "description": "Return focus to terminal after opening files",
+            },
+            "narrated": {
+                "type": "boolean",
+                "description": "Show vim commands as they execute (learning mode)",
+            },
+        },
+    }
+)
+
+_SCHEMA_EXPLAIN_COMMAND = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "command": {"type": "string", "description": "Vim command to explain"}
+        },
+        "required": ["command"],
+    }
+)
+
+_SCHEMA_SUGGEST_COMMAND = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {"task": {"type": "string", "description": "Task to accomplish"}},
+        "required": ["task"],
+    }
+)
+
+_SCHEMA_VIM_CHEATSHEET = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "category": {
+                "type": "string",
+                "description": "Category: movement, editing, search, etc.",
+            }
+        },
+    }
+)
+
+_SCHEMA_SET_TRUST_MODE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "mode": {
+                "type": "string",
+                "enum": ["guardian", "companion", "autopilot"],
+                "description": "Trust level for edits",
+            }
+        },
+        "required": ["mode"],
+    }
+)
+
+_SCHEMA_HARPOON_GOTO = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "index": {"type": "integer", "description": "Index in harpoon list (1-indexed)"}
+        },
+        "required": ["index"],
+    }
+)
+
+_SCHEMA_TROUBLE_TOGGLE = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "mode": {
+                "type": "string",
+                "enum": ["diagnostics", "todo", "quickfix", "loclist"],
+                "description": "Trouble mode",
+                "default": "diagnostics",
+            }
+        },
+    }
+)
+
+_SCHEMA_SEARCH_TODOS = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "keywords": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Keywords to search for (default: TODO, FIXME, HACK)",
+            }
+        },
+    }
+)
+
+_SCHEMA_SPECTRE_OPEN = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "search": {"type": "string", "description": "Initial search pattern"},
+            "replace": {"type": "string", "description": "Initial replacement"},
+        },
+    }
+)
+
+_SCHEMA_ADVANCED = MappingProxyType(
+    {
+        "type": "object",
+        "properties": {
+            "action": {
+                "type": "string",
+                "description": "Action: 'list' to show available hidden tools",
+            },
+            "tool": {
+                "type": "string",
+                "description": "Hidden tool name to call",
+            },
+            "arguments": {
+                "type": "object",
+                "description": "Arguments to pass to the hidden tool",
+            },
+        },
+    }
+)
+
+
 class PrismMCPServer:
     """
     MCP Server that provides Neovim IDE control to Claude.
@@ -173,6 +1099,8 @@ class PrismMCPServer:
         """
         self.nvim = NeovimClient(nvim_address)
         self.tools: dict[str, ToolDef] = {}
+        # Tool name -> bound handler, kept in step with self.tools
+        self._dispatch: dict[str, Callable] = {}
 
         # Active file tracking - remembers last opened file for smart defaults
         self.active_file: Optional[str] = None
@@ -190,6 +1118,20 @@ class PrismMCPServer:
         # Bookmarks storage
         self.bookmarks: dict[str, dict] = {}
 
+        # tools/list payload, built once on first request
+        self._mcp_tools: Optional[list[MCPTool]] = None
+
+        # Buffer lookup cache: requested path -> (bufnr, full buffer name)
+        self._buf_lookup: dict[str, tuple[int, str]] = {}
+
+        # Short-lived LRU of formatted READ_ONLY_TOOLS results
+        self._cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._cache_ttl = 0.3
+        self._cache_size = 256
+
+        # Most recent debounced call: (monotonic time, call key, formatted result)
+        self._last_call: Optional[tuple[float, tuple, str]] = None
+
         self._setup_tools()
 
     def _setup_tools(self):
@@ -202,7 +1144,7 @@ class PrismMCPServer:
         self._register_tool(
             name="debug_state",
             description="Debug: Check MCP server state (active file, version).",
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_debug_state,
         )
 
@@ -219,29 +1161,7 @@ Use this when the user says:
 - "let me see X" / "display X" / "view X"
 - "open that file" / "show the file"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the file to open (absolute or relative to cwd)",
-                    },
-                    "line": {
-                        "type": "integer",
-                        "description": "Line number to jump to after opening (1-indexed)",
-                    },
-                    "column": {
-                        "type": "integer",
-                        "description": "Column number to jump to after opening (1-indexed)",
-                    },
-                    "keep_focus": {
-                        "type": "boolean",
-                        "description": "Return focus to terminal after opening (default: true)",
-                        "default": True,
-                    },
-                },
-                "required": ["path"],
-            },
+            input_schema=_SCHEMA_OPEN_FILE,
             handler=self._handle_open_file,
         )
 
@@ -253,15 +1173,7 @@ Use this when the user says:
 - "save" / "save this" / "save the file"
 - "write it" / "commit changes" / "persist"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Optional new path to save to (save as)",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_SAVE_FILE,
             handler=self._handle_save_file,
         )
 
@@ -273,20 +1185,7 @@ Use this when the user says:
 - "close this" / "close the file" / "close X"
 - "done with this file" / "I'm finished with X"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path of file to close (current buffer if not specified)",
-                    },
-                    "force": {
-                        "type": "boolean",
-                        "description": "Force close without saving changes",
-                        "default": False,
-                    },
-                },
-            },
+            input_schema=_SCHEMA_CLOSE_FILE,
             handler=self._handle_close_file,
         )
 
@@ -298,18 +1197,7 @@ Use this when the user says:
 - "create X" / "make a new file" / "new file called X"
 - "create a file for X" / "start a new X file"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {"type": "string", "description": "Path for the new file"},
-                    "content": {
-                        "type": "string",
-                        "description": "Initial content for the file",
-                        "default": "",
-                    },
-                },
-                "required": ["path"],
-            },
+            input_schema=_SCHEMA_CREATE_FILE,
             handler=self._handle_create_file,
         )
 
@@ -325,15 +1213,7 @@ Use this when the user says:
 - "read X" / "show me what's in X" / "get the contents of X"
 - "what's in this file?" / "read the whole file"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path of file to read (current buffer if not specified)",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_GET_BUFFER_CONTENT,
             handler=self._handle_get_buffer_content,
         )
 
@@ -345,25 +1225,7 @@ Use this when the user says:
 - "show lines X to Y" / "read lines X-Y" / "get lines X through Y"
 - "show me line X" / "what's on line X?"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path of file (current buffer if not specified)",
-                    },
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line (1-indexed)",
-                        "default": 1,
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "description": "End line (inclusive, -1 for end of file)",
-                        "default": -1,
-                    },
-                },
-            },
+            input_schema=_SCHEMA_GET_BUFFER_LINES,
             handler=self._handle_get_buffer_lines,
         )
 
@@ -375,22 +1237,7 @@ Use this when the user says:
 - "replace the whole file with X" / "rewrite this file"
 - "set the content to X" / "overwrite everything with X"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "content": {"type": "string", "description": "New content for the buffer"},
-                    "path": {
-                        "type": "string",
-                        "description": "Path of file (current buffer if not specified)",
-                    },
-                    "auto_save": {
-                        "type": "boolean",
-                        "description": "Automatically save after edit (default: false)",
-                        "default": False,
-                    },
-                },
-                "required": ["content"],
-            },
+            input_schema=_SCHEMA_SET_BUFFER_CONTENT,
             handler=self._handle_set_buffer_content,
         )
 
@@ -402,34 +1249,7 @@ Use this when the user says:
 - "change lines X to Y" / "edit lines X-Y" / "modify lines X through Y"
 - "replace lines X to Y with Z" / "update those lines"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line to replace (1-indexed)",
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "description": "End line to replace (inclusive)",
-                    },
-                    "new_lines": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "New lines to insert",
-                    },
-                    "path": {
-                        "type": "string",
-                        "description": "Path of file (current buffer if not specified)",
-                    },
-                    "auto_save": {
-                        "type": "boolean",
-                        "description": "Automatically save after edit (default: false)",
-                        "default": False,
-                    },
-                },
-                "required": ["start_line", "end_line", "new_lines"],
-            },
+            input_schema=_SCHEMA_EDIT_BUFFER,
             handler=self._handle_edit_buffer,
         )
 
@@ -441,19 +1261,7 @@ Use this when the user says:
 - "insert X at line Y" / "add X on line Y" / "put X at line Y"
 - "insert X here" / "add this text"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "line": {"type": "integer", "description": "Line number (1-indexed)"},
-                    "column": {"type": "integer", "description": "Column number (0-indexed)"},
-                    "text": {"type": "string", "description": "Text to insert"},
-                    "path": {
-                        "type": "string",
-                        "description": "Path of file (current buffer if not specified)",
-                    },
-                },
-                "required": ["line", "column", "text"],
-            },
+            input_schema=_SCHEMA_INSERT_TEXT,
             handler=self._handle_insert_text,
         )
 
@@ -469,7 +1277,7 @@ Use this when the user says:
 - "what files are open?" / "show open files" / "list buffers"
 - "what do I have open?" / "show my buffers"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_open_files,
         )
 
@@ -481,7 +1289,7 @@ Use this when the user says:
 - "what file is this?" / "which file am I in?" / "current file"
 - "where am I?" / "what's the current buffer?"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_current_file,
         )
 
@@ -493,7 +1301,7 @@ Use this when the user says:
 - "where's the cursor?" / "cursor position" / "what line am I on?"
 - "where am I in the file?"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_cursor_position,
         )
 
@@ -505,14 +1313,7 @@ Use this when the user says:
 - "move cursor to line X column Y" / "put cursor at X,Y"
 - "position at line X, column Y"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "line": {"type": "integer", "description": "Line number (1-indexed)"},
-                    "column": {"type": "integer", "description": "Column number (0-indexed)"},
-                },
-                "required": ["line", "column"],
-            },
+            input_schema=_SCHEMA_SET_CURSOR_POSITION,
             handler=self._handle_set_cursor_position,
         )
 
@@ -524,7 +1325,7 @@ Use this when the user says:
 - "what's selected?" / "get the selection" / "show selected text"
 - "what did I highlight?"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_selection,
         )
 
@@ -540,17 +1341,7 @@ Use this when the user says:
 - "split the window" / "create a split" / "open in split"
 - "side by side" / "vertical split" / "horizontal split"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "vertical": {
-                        "type": "boolean",
-                        "description": "Create vertical split (side by side)",
-                        "default": False,
-                    },
-                    "path": {"type": "string", "description": "File to open in new split"},
-                },
-            },
+            input_schema=_SCHEMA_SPLIT_WINDOW,
             handler=self._handle_split_window,
         )
 
@@ -562,12 +1353,7 @@ Use this when the user says:
 - "close this window" / "close the split" / "close pane"
 - "get rid of this window"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "force": {"type": "boolean", "description": "Force close", "default": False}
-                },
-            },
+            input_schema=_SCHEMA_CLOSE_WINDOW,
             handler=self._handle_close_window,
         )
 
@@ -578,8 +1364,11 @@ Use this when the user says:
 Use this when the user says:
 - "what windows are open?" / "show windows" / "list splits"
 - "how many windows?" / "window layout"
+
+Returns parallel arrays: ids[i], paths[i], widths[i] and heights[i]
+describe window i.
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_windows,
         )
 
@@ -596,15 +1385,7 @@ Use this when the user says:
 - "list warnings" / "check for issues" / "diagnostics"
 - "are there any errors?" / "find problems"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path of file (current buffer if not specified)",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_GET_DIAGNOSTICS,
             handler=self._handle_get_diagnostics,
         )
 
@@ -616,7 +1397,7 @@ Use this when the user says:
 - "go to definition" / "where is this defined?" / "jump to definition"
 - "show me the definition" / "take me to where this is defined"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_goto_definition,
         )
 
@@ -628,7 +1409,7 @@ Use this when the user says:
 - "what is this?" / "hover info" / "show documentation"
 - "explain this symbol" / "what does this do?"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_hover_info,
         )
 
@@ -640,7 +1421,7 @@ Use this when the user says:
 - "format this" / "prettify" / "auto-format"
 - "fix formatting" / "clean up the code" / "make it pretty"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_format_file,
         )
 
@@ -655,14 +1436,11 @@ Use this when the user says:
 Use this when the user says:
 - "find X" / "search for X" / "look for X"
 - "where is X?" / "locate X in this file"
+
+Returns parallel arrays: lines[i] (1-indexed), columns[i] (0-indexed) and
+texts[i] describe match i; count is the number of matches.
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "pattern": {"type": "string", "description": "Search pattern (Lua pattern)"}
-                },
-                "required": ["pattern"],
-            },
+            input_schema=_SCHEMA_SEARCH_IN_FILE,
             handler=self._handle_search_in_file,
         )
 
@@ -674,19 +1452,7 @@ Use this when the user says:
 - "replace X with Y" / "change X to Y" / "substitute X for Y"
 - "find and replace" / "swap X for Y" / "rename X to Y"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "pattern": {"type": "string", "description": "Search pattern"},
-                    "replacement": {"type": "string", "description": "Replacement text"},
-                    "flags": {
-                        "type": "string",
-                        "description": "Flags: g (global), i (ignore case), c (confirm)",
-                        "default": "g",
-                    },
-                },
-                "required": ["pattern", "replacement"],
-            },
+            input_schema=_SCHEMA_SEARCH_AND_REPLACE,
             handler=self._handle_search_and_replace,
         )
 
@@ -702,7 +1468,7 @@ Use this when the user says:
 - "git status" / "what's changed?" / "show changes"
 - "any uncommitted changes?" / "what's modified?"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_git_status,
         )
 
@@ -714,16 +1480,7 @@ Use this when the user says:
 - "show diff" / "what changed?" / "git diff"
 - "show me the changes" / "what did I modify?"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "staged": {
-                        "type": "boolean",
-                        "description": "Show staged changes only",
-                        "default": False,
-                    }
-                },
-            },
+            input_schema=_SCHEMA_GIT_DIFF,
             handler=self._handle_git_diff,
         )
 
@@ -735,20 +1492,7 @@ Use this when the user says:
 - "stage this file" / "add to commit" / "git add"
 - "stage all changes" / "add everything"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "File path to stage (current file if not specified)",
-                    },
-                    "all": {
-                        "type": "boolean",
-                        "description": "Stage all changes (git add -A)",
-                        "default": False,
-                    },
-                },
-            },
+            input_schema=_SCHEMA_GIT_STAGE,
             handler=self._handle_git_stage,
         )
 
@@ -760,16 +1504,7 @@ Use this when the user says:
 - "commit this" / "commit with message X" / "save changes to git"
 - "make a commit" / "commit changes"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "message": {
-                        "type": "string",
-                        "description": "Commit message (required)",
-                    }
-                },
-                "required": ["message"],
-            },
+            input_schema=_SCHEMA_GIT_COMMIT,
             handler=self._handle_git_commit,
         )
 
@@ -781,15 +1516,7 @@ Use this when the user says:
 - "who wrote this?" / "blame" / "git blame"
 - "who changed this line?" / "author of this code"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "line": {
-                        "type": "integer",
-                        "description": "Line number (current line if not specified)",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_GIT_BLAME,
             handler=self._handle_git_blame,
         )
 
@@ -801,20 +1528,7 @@ Use this when the user says:
 - "show commits" / "git log" / "commit history"
 - "recent changes" / "what was committed?"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "count": {
-                        "type": "integer",
-                        "description": "Number of commits to show",
-                        "default": 10,
-                    },
-                    "path": {
-                        "type": "string",
-                        "description": "Filter to commits affecting this path",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_GIT_LOG,
             handler=self._handle_git_log,
         )
 
@@ -830,17 +1544,7 @@ Use this when the user says:
 - "go to line X" / "jump to line X" / "line X"
 - "take me to line X"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "line": {"type": "integer", "description": "Line number (1-indexed)"},
-                    "path": {
-                        "type": "string",
-                        "description": "File path (default: current buffer)",
-                    },
-                },
-                "required": ["line"],
-            },
+            input_schema=_SCHEMA_GOTO_LINE,
             handler=self._handle_goto_line,
         )
 
@@ -852,15 +1556,7 @@ Use this when the user says:
 - "go to matching bracket" / "jump to pair" / "matching paren"
 - "find the closing bracket"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "File path (default: current buffer)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_GOTO_MATCHING,
             handler=self._handle_goto_matching,
         )
 
@@ -872,19 +1568,7 @@ Use this when the user says:
 - "next error" / "go to next problem" / "next issue"
 - "jump to next warning"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "severity": {
-                        "type": "string",
-                        "description": "Filter by severity: error, warning, info, hint",
-                    },
-                    "path": {
-                        "type": "string",
-                        "description": "File path (default: current buffer)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_DIAGNOSTIC_JUMP,
             handler=self._handle_next_error,
         )
 
@@ -896,19 +1580,7 @@ Use this when the user says:
 - "previous error" / "go to previous problem" / "last error"
 - "jump to previous warning"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "severity": {
-                        "type": "string",
-                        "description": "Filter by severity: error, warning, info, hint",
-                    },
-                    "path": {
-                        "type": "string",
-                        "description": "File path (default: current buffer)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_DIAGNOSTIC_JUMP,
             handler=self._handle_prev_error,
         )
 
@@ -920,16 +1592,7 @@ Use this when the user says:
 - "go back" / "previous location" / "jump back"
 - "where was I before?"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "count": {
-                        "type": "integer",
-                        "description": "Number of jumps back",
-                        "default": 1,
-                    }
-                },
-            },
+            input_schema=_SCHEMA_JUMP_BACK,
             handler=self._handle_jump_back,
         )
 
@@ -940,16 +1603,7 @@ Use this when the user says:
 Use this when the user says:
 - "go forward" / "next location" / "jump forward"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "count": {
-                        "type": "integer",
-                        "description": "Number of jumps forward",
-                        "default": 1,
-                    }
-                },
-            },
+            input_schema=_SCHEMA_JUMP_FORWARD,
             handler=self._handle_jump_forward,
         )
 
@@ -965,20 +1619,7 @@ Use this when the user says:
 - "undo" / "undo that" / "go back"
 - "reverse that" / "ctrl+z"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "count": {
-                        "type": "integer",
-                        "description": "Number of changes to undo",
-                        "default": 1,
-                    },
-                    "path": {
-                        "type": "string",
-                        "description": "File path (default: current buffer)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_UNDO,
             handler=self._handle_undo,
         )
 
@@ -990,20 +1631,7 @@ Use this when the user says:
 - "redo" / "redo that" / "bring it back"
 - "ctrl+y"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "count": {
-                        "type": "integer",
-                        "description": "Number of changes to redo",
-                        "default": 1,
-                    },
-                    "path": {
-                        "type": "string",
-                        "description": "File path (default: current buffer)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_REDO,
             handler=self._handle_redo,
         )
 
@@ -1019,7 +1647,7 @@ Use this when the user says:
 - "find references" / "where is this used?" / "show usages"
 - "who uses this?" / "find all occurrences"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_references,
         )
 
@@ -1031,13 +1659,7 @@ Use this when the user says:
 - "rename X to Y" / "refactor name" / "change name"
 - "rename this symbol"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "new_name": {"type": "string", "description": "New name for the symbol"}
-                },
-                "required": ["new_name"],
-            },
+            input_schema=_SCHEMA_RENAME_SYMBOL,
             handler=self._handle_rename_symbol,
         )
 
@@ -1049,16 +1671,7 @@ Use this when the user says:
 - "fix this" / "quick fix" / "code actions"
 - "what can I do here?" / "auto-fix"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "apply_first": {
-                        "type": "boolean",
-                        "description": "Automatically apply the first action",
-                        "default": False,
-                    }
-                },
-            },
+            input_schema=_SCHEMA_CODE_ACTIONS,
             handler=self._handle_code_actions,
         )
 
@@ -1070,7 +1683,7 @@ Use this when the user says:
 - "show functions" / "list symbols" / "outline"
 - "what functions are in this file?" / "document symbols"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_list_symbols,
         )
 
@@ -1082,17 +1695,7 @@ Use this when the user says:
 - "go to function X" / "jump to class X" / "find method X"
 - "take me to the X function"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Symbol name to find"},
-                    "kind": {
-                        "type": "string",
-                        "description": "Symbol kind filter (function, class, method, etc.)",
-                    },
-                },
-                "required": ["name"],
-            },
+            input_schema=_SCHEMA_GOTO_SYMBOL,
             handler=self._handle_goto_symbol,
         )
 
@@ -1108,20 +1711,7 @@ Use this when the user says:
 - "fold this" / "collapse this" / "hide this block"
 - "fold all" / "collapse everything"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "line": {
-                        "type": "integer",
-                        "description": "Line to fold (cursor if not specified)",
-                    },
-                    "all": {
-                        "type": "boolean",
-                        "description": "Fold all foldable regions",
-                        "default": False,
-                    },
-                },
-            },
+            input_schema=_SCHEMA_FOLD,
             handler=self._handle_fold,
         )
 
@@ -1133,20 +1723,7 @@ Use this when the user says:
 - "unfold this" / "expand this" / "show this block"
 - "unfold all" / "expand everything"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "line": {
-                        "type": "integer",
-                        "description": "Line to unfold (cursor if not specified)",
-                    },
-                    "all": {
-                        "type": "boolean",
-                        "description": "Unfold all regions",
-                        "default": False,
-                    },
-                },
-            },
+            input_schema=_SCHEMA_UNFOLD,
             handler=self._handle_unfold,
         )
 
@@ -1162,14 +1739,7 @@ Use this when the user says:
 - "bookmark this" / "mark this spot" / "save this location"
 - "create bookmark X"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Name for the bookmark"},
-                    "description": {"type": "string", "description": "Optional description"},
-                },
-                "required": ["name"],
-            },
+            input_schema=_SCHEMA_BOOKMARK,
             handler=self._handle_bookmark,
         )
 
@@ -1180,11 +1750,7 @@ Use this when the user says:
 Use this when the user says:
 - "go to bookmark X" / "jump to X" / "open bookmark X"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {"name": {"type": "string", "description": "Bookmark name"}},
-                "required": ["name"],
-            },
+            input_schema=_SCHEMA_GOTO_BOOKMARK,
             handler=self._handle_goto_bookmark,
         )
 
@@ -1195,7 +1761,7 @@ Use this when the user says:
 Use this when the user says:
 - "show bookmarks" / "list bookmarks" / "my bookmarks"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_list_bookmarks,
         )
 
@@ -1206,13 +1772,7 @@ Use this when the user says:
 Use this when the user says:
 - "delete bookmark X" / "remove bookmark X"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string", "description": "Bookmark name to delete"}
-                },
-                "required": ["name"],
-            },
+            input_schema=_SCHEMA_DELETE_BOOKMARK,
             handler=self._handle_delete_bookmark,
         )
 
@@ -1228,19 +1788,7 @@ Use this when the user says:
 - "comment this" / "toggle comment" / "comment out"
 - "uncomment this" / "remove comment"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line (current if not specified)",
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "description": "End line (same as start if not specified)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_LINE_RANGE,
             handler=self._handle_comment,
         )
 
@@ -1251,16 +1799,7 @@ Use this when the user says:
 Use this when the user says:
 - "duplicate this line" / "copy line down" / "dup line"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "line": {
-                        "type": "integer",
-                        "description": "Line to duplicate (current if not specified)",
-                    },
-                    "count": {"type": "integer", "description": "Number of copies", "default": 1},
-                },
-            },
+            input_schema=_SCHEMA_DUPLICATE_LINE,
             handler=self._handle_duplicate_line,
         )
 
@@ -1271,22 +1810,7 @@ Use this when the user says:
 Use this when the user says:
 - "move line up" / "move line down" / "move this up"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "direction": {
-                        "type": "string",
-                        "enum": ["up", "down"],
-                        "description": "Direction to move",
-                    },
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line (current if not specified)",
-                    },
-                    "end_line": {"type": "integer", "description": "End line for range move"},
-                },
-                "required": ["direction"],
-            },
+            input_schema=_SCHEMA_MOVE_LINE,
             handler=self._handle_move_line,
         )
 
@@ -1298,19 +1822,7 @@ Use this when the user says:
 - "delete this line" / "remove line" / "kill line"
 - "delete lines X to Y"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line (current if not specified)",
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "description": "End line (same as start if not specified)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_LINE_RANGE,
             handler=self._handle_delete_line,
         )
 
@@ -1321,16 +1833,7 @@ Use this when the user says:
 Use this when the user says:
 - "join lines" / "merge lines" / "combine lines"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "count": {
-                        "type": "integer",
-                        "description": "Number of lines to join",
-                        "default": 2,
-                    }
-                },
-            },
+            input_schema=_SCHEMA_JOIN_LINES,
             handler=self._handle_join_lines,
         )
 
@@ -1345,7 +1848,7 @@ Use this when the user says:
 Use this when the user says:
 - "select this word" / "select word" / "highlight word"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_select_word,
         )
 
@@ -1357,19 +1860,7 @@ Use this when the user says:
 - "select this line" / "select line" / "highlight line"
 - "select lines X to Y"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line (current if not specified)",
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "description": "End line (same as start if not specified)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_LINE_RANGE,
             handler=self._handle_select_line,
         )
 
@@ -1381,21 +1872,7 @@ Use this when the user says:
 - "select this block" / "select inside braces" / "select function body"
 - "select inside parentheses"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "type": {
-                        "type": "string",
-                        "description": "Block type: braces, brackets, parens, quotes",
-                        "default": "braces",
-                    },
-                    "around": {
-                        "type": "boolean",
-                        "description": "Include the delimiters",
-                        "default": False,
-                    },
-                },
-            },
+            input_schema=_SCHEMA_SELECT_BLOCK,
             handler=self._handle_select_block,
         )
 
@@ -1406,7 +1883,7 @@ Use this when the user says:
 Use this when the user says:
 - "select all" / "select everything" / "highlight all"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_select_all,
         )
 
@@ -1422,20 +1899,7 @@ Use this when the user says:
 - "indent this" / "add indent" / "tab in"
 - "indent lines X to Y"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line (current if not specified)",
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "description": "End line (same as start if not specified)",
-                    },
-                    "count": {"type": "integer", "description": "Indent levels", "default": 1},
-                },
-            },
+            input_schema=_SCHEMA_INDENT,
             handler=self._handle_indent,
         )
 
@@ -1447,20 +1911,7 @@ Use this when the user says:
 - "dedent this" / "remove indent" / "tab out"
 - "unindent" / "shift left"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "start_line": {
-                        "type": "integer",
-                        "description": "Start line (current if not specified)",
-                    },
-                    "end_line": {
-                        "type": "integer",
-                        "description": "End line (same as start if not specified)",
-                    },
-                    "count": {"type": "integer", "description": "Dedent levels", "default": 1},
-                },
-            },
+            input_schema=_SCHEMA_DEDENT,
             handler=self._handle_dedent,
         )
 
@@ -1475,17 +1926,7 @@ Use this when the user says:
 Use this when the user says:
 - "open terminal" / "new terminal" / "shell"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "split": {
-                        "type": "string",
-                        "enum": ["horizontal", "vertical", "tab"],
-                        "description": "How to open the terminal",
-                        "default": "horizontal",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_OPEN_TERMINAL,
             handler=self._handle_open_terminal,
         )
 
@@ -1501,13 +1942,7 @@ Use this when the user says:
 - "run vim command X" / "execute :X" / "do :X"
 - Or for advanced operations not covered by other tools
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "command": {"type": "string", "description": "The ex command to execute"}
-                },
-                "required": ["command"],
-            },
+            input_schema=_SCHEMA_RUN_COMMAND,
             handler=self._handle_run_command,
         )
 
@@ -1522,19 +1957,7 @@ Use this when the user says:
 Use this when the user says:
 - "tell me X" / "notify me" / "show message"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "message": {"type": "string", "description": "Message to display"},
-                    "level": {
-                        "type": "string",
-                        "enum": ["info", "warn", "error"],
-                        "description": "Notification level",
-                        "default": "info",
-                    },
-                },
-                "required": ["message"],
-            },
+            input_schema=_SCHEMA_NOTIFY,
             handler=self._handle_notify,
         )
 
@@ -1549,14 +1972,7 @@ Use this when the user says:
 Use this when the user says:
 - "show me the diff" / "preview changes" / "what will change?"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "path": {"type": "string", "description": "Path to file"},
-                    "new_content": {"type": "string", "description": "Proposed new content"},
-                },
-                "required": ["path", "new_content"],
-            },
+            input_schema=_SCHEMA_DIFF_PREVIEW,
             handler=self._handle_diff_preview,
         )
 
@@ -1571,7 +1987,7 @@ Use this when the user says:
 Use this when the user says:
 - "show config" / "what are the settings?" / "current config"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_get_config,
         )
 
@@ -1582,23 +1998,7 @@ Use this when the user says:
 Use this when the user says:
 - "turn on auto-save" / "enable narrated mode" / "change config"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "auto_save": {
-                        "type": "boolean",
-                        "description": "Auto-save after edits",
-                    },
-                    "keep_focus": {
-                        "type": "boolean",
-                        "description": "Return focus to terminal after opening files",
-                    },
-                    "narrated": {
-                        "type": "boolean",
-                        "description": "Show vim commands as they execute (learning mode)",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_SET_CONFIG,
             handler=self._handle_set_config,
         )
 
@@ -1613,13 +2013,7 @@ Use this when the user says:
 Use this when the user says:
 - "what does X do?" / "explain vim command X" / "what is X?"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "command": {"type": "string", "description": "Vim command to explain"}
-                },
-                "required": ["command"],
-            },
+            input_schema=_SCHEMA_EXPLAIN_COMMAND,
             handler=self._handle_explain_command,
         )
 
@@ -1630,11 +2024,7 @@ Use this when the user says:
 Use this when the user says:
 - "how do I X in vim?" / "vim way to X" / "what command does X?"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {"task": {"type": "string", "description": "Task to accomplish"}},
-                "required": ["task"],
-            },
+            input_schema=_SCHEMA_SUGGEST_COMMAND,
             handler=self._handle_suggest_command,
         )
 
@@ -1645,15 +2035,7 @@ Use this when the user says:
 Use this when the user says:
 - "vim cheatsheet" / "show vim commands" / "vim help"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "category": {
-                        "type": "string",
-                        "description": "Category: movement, editing, search, etc.",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_VIM_CHEATSHEET,
             handler=self._handle_vim_cheatsheet,
         )
 
@@ -1675,17 +2057,7 @@ Use this when the user says:
 - "that's fine" / "I trust you" -> companion
 - "just do it" / "full speed" / "autopilot" -> autopilot
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "mode": {
-                        "type": "string",
-                        "enum": ["guardian", "companion", "autopilot"],
-                        "description": "Trust level for edits",
-                    }
-                },
-                "required": ["mode"],
-            },
+            input_schema=_SCHEMA_SET_TRUST_MODE,
             handler=self._handle_set_trust_mode,
         )
 
@@ -1700,7 +2072,7 @@ Use this when the user says:
 Use this when the user says:
 - "mark this file" / "add to harpoon" / "pin this"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_harpoon_add,
         )
 
@@ -1711,7 +2083,7 @@ Use this when the user says:
 Use this when the user says:
 - "show harpoon" / "pinned files" / "harpoon list"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_harpoon_list,
         )
 
@@ -1722,13 +2094,7 @@ Use this when the user says:
 Use this when the user says:
 - "go to harpoon 1" / "jump to file 2" / "harpoon 3"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "index": {"type": "integer", "description": "Index in harpoon list (1-indexed)"}
-                },
-                "required": ["index"],
-            },
+            input_schema=_SCHEMA_HARPOON_GOTO,
             handler=self._handle_harpoon_goto,
         )
 
@@ -1739,7 +2105,7 @@ Use this when the user says:
 Use this when the user says:
 - "unpin this" / "remove from harpoon"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_harpoon_remove,
         )
 
@@ -1754,17 +2120,7 @@ Use this when the user says:
 Use this when the user says:
 - "show trouble" / "diagnostics panel" / "all errors"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "mode": {
-                        "type": "string",
-                        "enum": ["diagnostics", "todo", "quickfix", "loclist"],
-                        "description": "Trouble mode",
-                        "default": "diagnostics",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_TROUBLE_TOGGLE,
             handler=self._handle_trouble_toggle,
         )
 
@@ -1775,16 +2131,7 @@ Use this when the user says:
 Use this when the user says:
 - "show todos" / "find todos" / "list TODOs"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "keywords": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Keywords to search for (default: TODO, FIXME, HACK)",
-                    }
-                },
-            },
+            input_schema=_SCHEMA_SEARCH_TODOS,
             handler=self._handle_search_todos,
         )
 
@@ -1795,7 +2142,7 @@ Use this when the user says:
 Use this when the user says:
 - "next todo" / "go to next TODO"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_next_todo,
         )
 
@@ -1806,7 +2153,7 @@ Use this when the user says:
 Use this when the user says:
 - "previous todo"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_prev_todo,
         )
 
@@ -1821,13 +2168,7 @@ Use this when the user says:
 Use this when the user says:
 - "search and replace in project" / "bulk replace"
 """,
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "search": {"type": "string", "description": "Initial search pattern"},
-                    "replace": {"type": "string", "description": "Initial replacement"},
-                },
-            },
+            input_schema=_SCHEMA_SPECTRE_OPEN,
             handler=self._handle_spectre_open,
         )
 
@@ -1838,7 +2179,7 @@ Use this when the user says:
 Use this when the user says:
 - "replace this word everywhere"
 """,
-            input_schema={"type": "object", "properties": {}},
+            input_schema=_SCHEMA_NO_ARGS,
             handler=self._handle_spectre_word,
         )
 
@@ -1853,54 +2194,73 @@ Use this when the user says:
 Use action='list' to see all 60+ hidden tools.
 Or call directly: tool='<name>', arguments={...}.
 Example: {"tool": "git_blame", "arguments": {}}""",
-            input_schema={
-                "type": "object",
-                "properties": {
-                    "action": {
-                        "type": "string",
-                        "description": "Action: 'list' to show available hidden tools",
-                    },
-                    "tool": {
-                        "type": "string",
-                        "description": "Hidden tool name to call",
-                    },
-                    "arguments": {
-                        "type": "object",
-                        "description": "Arguments to pass to the hidden tool",
-                    },
-                },
-            },
+            input_schema=_SCHEMA_ADVANCED,
             handler=self._handle_advanced,
         )
 
-    def _register_tool(self, name: str, description: str, input_schema: dict, handler: Callable):
+    def _register_tool(
+        self, name: str, description: str, input_schema: Mapping, handler: Callable
+    ):
         """Register a tool with the server."""
         self.tools[name] = ToolDef(
             name=name, description=description, input_schema=input_schema, handler=handler
         )
+        self._dispatch[name] = handler
+        self._mcp_tools = None
 
     def get_mcp_tools(self) -> list[MCPTool]:
-        """Return tools in MCP SDK format (filters hidden tools to save context)."""
-        return [
-            MCPTool(name=t.name, description=t.description, inputSchema=t.input_schema)
-            for t in self.tools.values()
-            if t.name not in HIDDEN_TOOLS
-        ]
+        """Return tools in MCP SDK format (filters hidden tools to save context).
+
+        Tool definitions are static after setup, so the list is built once and
+        reused for every tools/list request (clients re-list on reconnect).
+        """
+        if self._mcp_tools is None:
+            self._mcp_tools = [
+                MCPTool(name=t.name, description=t.description, inputSchema=dict(t.input_schema))
+                for t in self.tools.values()
+                if t.name not in HIDDEN_TOOLS
+            ]
+        return self._mcp_tools
 
     def call_tool(self, name: str, arguments: dict) -> str:
         """Call a tool and return formatted result."""
-        if name not in self.tools:
+        handler = self._dispatch.get(name)
+        if handler is None:
             return f"Unknown tool: {name}"
 
-        tool = self.tools[name]
-        try:
-            result = tool.handler(**arguments)
-            return self._format_result(name, result)
-        except Exception as e:
-            logger.error(f"Tool error: {e}")
-            import traceback
-
-            logger.error(traceback.format_exc())
+        window = DEBOUNCE_TOOLS.get(name)
+        call_key = _cache_key(name, arguments) if window else None
+        last = self._last_call
+        if call_key and last and last[1] == call_key and time.monotonic() - last[0] < window:
+            return last[2]
+        # Only an immediate repeat is coalesced; any other call resets it
+        self._last_call = None
+
+        key = None
+        if name in READ_ONLY_TOOLS:
+            key = _cache_key(name, arguments)
+            cached = self._cache.get(key) if key else None
+            if cached and time.monotonic() - cached[0] < self._cache_ttl:
+                self._cache.move_to_end(key)
+                return cached[1]
+        else:
+            # Any other tool may change editor state
+            self._cache.clear()
+
+        try:
+            result = handler(**arguments) if arguments else handler()
+            text = self._format_result(name, result)
+            ok = not isinstance(result, dict) or result.get("success") is not False
+            if key and ok:
+                self._cache[key] = (time.monotonic(), text)
+                self._cache.move_to_end(key)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            if call_key and ok:
+                self._last_call = (time.monotonic(), call_key, text)
+            return text
+        except Exception as e:
+            logger.exception("Tool error: %s", e)
             return f"Error: {e}"
 
     # =========================================================================
@@ -1921,6 +2281,7 @@ Example: {"tool": "git_blame", "arguments": {}}""",
         """Open a file in the editor."""
         try:
             # Resolve absolute path
+            path = _norm_path(path)
             if not os.path.isabs(path):
                 cwd = self.nvim.func("getcwd")
                 path = os.path.join(cwd, path)
@@ -1941,7 +2302,7 @@ Example: {"tool": "git_blame", "arguments": {}}""",
 
             # Track as active file for subsequent operations
             self.active_file = path
-            logger.info(f"Set active_file to: {path}")
+            logger.info("Set active_file to: %s", path)
             self._narrate(f"Open file (:e {path})")
             return {"success": True, "path": path, "active": True}
         except Exception as e:
@@ -1968,13 +2329,11 @@ Example: {"tool": "git_blame", "arguments": {}}""",
         try:
             cmd = "bdelete!" if force else "bdelete"
             if path:
-                # Find buffer by path
-                bufs = self.nvim.func("getbufinfo", {"buflisted": 1})
-                for buf in bufs:
-                    if _path_matches(buf.get("name", ""), path):
-                        self.nvim.command(f"{cmd} {buf['bufnr']}")
-                        return {"success": True}
-                return {"success": False, "error": f"Buffer not found: {path}"}
+                bufnr = self._find_buffer(path)
+                if bufnr is None:
+                    return {"success": False, "error": f"Buffer not found: {path}"}
+                self.nvim.command(f"{cmd} {bufnr}")
+                return {"success": True}
             else:
                 self.nvim.command(cmd)
             self._narrate(f"Close buffer (:{cmd})")
@@ -2005,8 +2364,7 @@ Example: {"tool": "git_blame", "arguments": {}}""",
         """Get buffer content."""
         try:
             buf = self._get_buffer(path)
-            lines = self.nvim.call("nvim_buf_get_lines", buf, 0, -1, False)
-            return {"content": "\n".join(lines)}
+            return {"content": self.nvim.get_buffer_content(buf)}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -2019,7 +2377,7 @@ Example: {"tool": "git_blame", "arguments": {}}""",
             # Convert to 0-indexed
             start = max(0, start_line - 1)
             end = end_line if end_line == -1 else end_line
-            lines = self.nvim.call("nvim_buf_get_lines", buf, start, end, False)
+            lines = self.nvim.get_buffer_lines(start, end, buf)
             return {"lines": lines, "start_line": start_line}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -2034,7 +2392,7 @@ Example: {"tool": "git_blame", "arguments": {}}""",
             self.nvim.call("nvim_buf_set_lines", buf, 0, -1, False, lines)
 
             if auto_save or self.config.get("auto_save", False):
-                self.nvim.command("write")
+                self.nvim.write_buffer(buf)
                 return {"success": True, "lines_changed": len(lines), "saved": True}
 
             return {"success": True, "lines_changed": len(lines)}
@@ -2057,7 +2415,7 @@ Example: {"tool": "git_blame", "arguments": {}}""",
             self.nvim.call("nvim_buf_set_lines", buf, start, end_line, False, new_lines)
 
             if auto_save or self.config.get("auto_save", False):
-                self.nvim.command("write")
+                self.nvim.write_buffer(buf)
                 return {"success": True, "lines_changed": len(new_lines), "saved": True}
 
             return {"success": True, "lines_changed": len(new_lines)}
@@ -2119,12 +2477,16 @@ Example: {"tool": "git_blame", "arguments": {}}""",
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def _handle_set_cursor_position(self, line: int, column: int) -> dict:
+    def _handle_set_cursor_position(self, line: int, column: int, wait: bool = True) -> dict:
         """Set cursor position."""
         try:
-            self.nvim.func("cursor", line, column)
+            if wait:
+                self.nvim.func("cursor", line, column)
+            else:
+                # Fire-and-forget on request: errors are not reported back
+                self.nvim.notify_oneway("nvim_call_function", "cursor", [line, column])
             self._narrate(f"Move cursor ({line}G{column}|)")
-            return {"success": True}
+            return {"success": True} if wait else {"success": True, "acked": False}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -2181,19 +2543,16 @@ Example: {"tool": "git_blame", "arguments": {}}""",
         """Get window information."""
         try:
             wins = self.nvim.func("getwininfo")
-            windows = []
-            for win in wins:
-                buf = self.nvim.call("nvim_win_get_buf", win["winid"])
-                path = self.nvim.call("nvim_buf_get_name", buf)
-                windows.append(
-                    {
-                        "id": win["winid"],
-                        "path": path,
-                        "width": win.get("width", 0),
-                        "height": win.get("height", 0),
-                    }
-                )
-            return {"windows": windows}
+            # getwininfo already carries bufnr; fetch all names in one batch
+            paths = self.nvim.call_atomic(
+                [["nvim_buf_get_name", [win["bufnr"]]] for win in wins]
+            )
+            return {
+                "ids": [win["winid"] for win in wins],
+                "paths": paths,
+                "widths": [win.get("width", 0) for win in wins],
+                "heights": [win.get("height", 0) for win in wins],
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -2240,8 +2599,6 @@ Example: {"tool": "git_blame", "arguments": {}}""",
             self.nvim.command("lua vim.lsp.buf.definition()")
             self._narrate("Go to definition (gd)")
             # Wait a bit and get new position
-            import time
-
             time.sleep(0.1)
             path = self.nvim.func("expand", "%:p")
             pos = self.nvim.func("getpos", ".")
@@ -2274,19 +2631,27 @@ Example: {"tool": "git_blame", "arguments": {}}""",
             buf = self.nvim.call("nvim_get_current_buf")
             lines = self.nvim.call("nvim_buf_get_lines", buf, 0, -1, False)
 
-            matches = []
-            import re
+            # Parallel columns instead of one dict per match
+            match_lines, columns, texts = [], [], []
+            finditer = re.compile(pattern).finditer
 
-            for i, line in enumerate(lines):
-                for m in re.finditer(pattern, line):
-                    matches.append({"line": i + 1, "column": m.start(), "text": m.group()})
+            for i, line in enumerate(lines, 1):
+                for m in finditer(line):
+                    match_lines.append(i)
+                    columns.append(m.start())
+                    texts.append(m.group())
 
             # Highlight first match
-            if matches:
+            if match_lines:
                 self.nvim.command(f"/{pattern}")
                 self._narrate(f"Search (/{pattern})")
 
-            return {"matches": matches, "count": len(matches)}
+            return {
+                "lines": match_lines,
+                "columns": columns,
+                "texts": texts,
+                "count": len(match_lines),
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -2312,8 +2677,6 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _handle_git_status(self) -> dict:
         """Get git status."""
         try:
-            import subprocess
-
             cwd = self.nvim.func("getcwd")
             result = subprocess.run(
                 ["git", "status", "--porcelain"],
@@ -2334,8 +2697,6 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _handle_git_diff(self, staged: bool = False) -> dict:
         """Get git diff."""
         try:
-            import subprocess
-
             cwd = self.nvim.func("getcwd")
             cmd = ["git", "diff"]
             if staged:
@@ -2348,8 +2709,6 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _handle_git_stage(self, path: str = None, all: bool = False) -> dict:
         """Stage files for commit."""
         try:
-            import subprocess
-
             cwd = self.nvim.func("getcwd")
             if all:
                 cmd = ["git", "add", "-A"]
@@ -2366,8 +2725,6 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _handle_git_commit(self, message: str) -> dict:
         """Commit staged changes."""
         try:
-            import subprocess
-
             cwd = self.nvim.func("getcwd")
             subprocess.run(["git", "commit", "-m", message], cwd=cwd, check=True)
             return {"success": True, "message": message}
@@ -2377,8 +2734,6 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _handle_git_blame(self, line: int = None) -> dict:
         """Git blame for a line."""
         try:
-            import subprocess
-
             cwd = self.nvim.func("getcwd")
             path = self.nvim.func("expand", "%:p")
             if line is None:
@@ -2396,8 +2751,6 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _handle_git_log(self, count: int = 10, path: str = None) -> dict:
         """Show git log."""
         try:
-            import subprocess
-
             cwd = self.nvim.func("getcwd")
             cmd = ["git", "log", f"-{count}", "--oneline"]
             if path:
@@ -2865,9 +3218,8 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _handle_notify(self, message: str, level: str = "info") -> dict:
         """Show notification."""
         try:
-            level_map = {"info": "INFO", "warn": "WARN", "error": "ERROR"}
-            vim_level = level_map.get(level, "INFO")
-            self.nvim.command(f'lua vim.notify("{message}", vim.log.levels.{vim_level})')
+            # Message travels as a msgpack string arg, not spliced into Lua source
+            self.nvim.notify(message, level)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -3072,12 +3424,13 @@ Example: {"tool": "git_blame", "arguments": {}}""",
         if tool:
             if tool not in HIDDEN_TOOLS:
                 return {"error": f"Unknown tool: {tool}. Use action='list' to see available tools."}
-            if tool not in self.tools:
+            handler = self._dispatch.get(tool)
+            if handler is None:
                 return {"error": f"Tool {tool} not registered"}
 
             # Call the hidden tool
             try:
-                result = self.tools[tool].handler(**arguments)
+                result = handler(**arguments)
                 return {"tool": tool, "result": result}
             except Exception as e:
                 return {"tool": tool, "error": str(e)}
@@ -3105,29 +3458,51 @@ Example: {"tool": "git_blame", "arguments": {}}""",
     def _get_buffer(self, path: str = None) -> int:
         """Get buffer number for path (or active file, or current buffer)."""
         # Use active_file as default if no path specified
-        logger.info(f"_get_buffer called: path={path}, active_file={self.active_file}")
+        logger.debug("_get_buffer called: path=%s, active_file=%s", path, self.active_file)
         if path is None and self.active_file:
             path = self.active_file
-            logger.info(f"Using active_file: {path}")
+            logger.debug("Using active_file: %s", path)
 
         if path is None:
-            logger.info("No path and no active_file, returning current buffer")
+            logger.debug("No path and no active_file, returning current buffer")
             return self.nvim.call("nvim_get_current_buf")
 
-        bufs = self.nvim.func("getbufinfo", {"buflisted": 1})
-        for buf in bufs:
-            if _path_matches(buf.get("name", ""), path):
-                return buf["bufnr"]
+        bufnr = self._find_buffer(path)
+        if bufnr is not None:
+            return bufnr
 
         # Not found, try to open it
         self.nvim.command(f"edit {path}")
         return self.nvim.call("nvim_get_current_buf")
 
+    def _find_buffer(self, path: str) -> Optional[int]:
+        """Find the listed buffer matching path, or None.
+
+        Cached hits are confirmed with one small RPC (the buffer must still be
+        listed under the same name); misses fetch all listed buffer names in a
+        single call instead of the heavyweight getbufinfo().
+        """
+        path = _norm_path(path)
+        hit = self._buf_lookup.get(path)
+        if hit:
+            bufnr, name = hit
+            if self.nvim.lua(_LISTED_BUF_NAME_LUA, bufnr) == name:
+                return bufnr
+            del self._buf_lookup[path]
+
+        for bufnr, name in self.nvim.lua(_LISTED_BUFS_LUA) or []:
+            if _path_matches(name, path):
+                if len(self._buf_lookup) >= 256:
+                    self._buf_lookup.clear()
+                self._buf_lookup[path] = (bufnr, name)
+                return bufnr
+        return None
+
     def _validate_buffer_editable(self, buf: int) -> bool:
         """Check if buffer is editable (not terminal or special buffer)."""
         buftype = self.nvim.call("nvim_get_option_value", "buftype", {"buf": buf})
         if buftype in ("terminal", "nofile", "prompt", "quickfix"):
-            logger.info(f"Buffer {buf} not editable: buftype={buftype}")
+            logger.info("Buffer %s not editable: buftype=%s", buf, buftype)
             return False
         modifiable = self.nvim.call("nvim_get_option_value", "modifiable", {"buf": buf})
         return modifiable
@@ -3168,7 +3543,7 @@ Example: {"tool": "git_blame", "arguments": {}}""",
             return f"Error: {error}"
 
         # Simple success cases
-        if result == {"success": True}:
+        if len(result) == 1 and result.get("success") is True:
             return "Done"
 
         # Handle specific tool outputs
@@ -3177,6 +3552,9 @@ Example: {"tool": "git_blame", "arguments": {}}""",
                 return "Done (terminal protected)"
             return "Done"
 
+        if tool_name == "set_cursor_position":
+            return "Done"
+
         if tool_name == "save_file":
             return "Saved"
 
@@ -3248,14 +3626,14 @@ Example: {"tool": "git_blame", "arguments": {}}""",
             return "\n".join(lines)
 
         if tool_name == "git_status":
-            return json.dumps(result, indent=2, cls=BytesEncoder)
+            return _to_json(result)
 
         if tool_name == "git_diff":
             diff = result.get("diff", "")
             return diff if diff else "(no changes)"
 
         # Fallback: return JSON for unknown structures
-        return json.dumps(result, indent=2, cls=BytesEncoder)
+        return _to_json(result)
 
 
 # Global server instance
@@ -3281,6 +3659,12 @@ def ensure_nvim_connected():
         _nvim_connected = True
 
 
+# Fixed status replies are answered with shared content blocks
+_STATUS_CONTENT = {
+    text: TextContent(type="text", text=text)
+    for text in ("Done", "Done (terminal protected)", "Saved", "Closed", "Updated")
+}
+
 # Create MCP server using the SDK
 mcp_server = Server("prism-nvim")
 
@@ -3298,15 +3682,22 @@ async def call_tool(name: str, arguments: dict):
     ensure_nvim_connected()
     server = get_server()
     result = server.call_tool(name, arguments)
-    return [TextContent(type="text", text=result)]
+    return [_STATUS_CONTENT.get(result) or TextContent(type="text", text=result)]
 
 
 def main():
     """Main entry point using MCP SDK."""
+    # Log records are queued on the request path and written to disk by a
+    # background listener thread, so file I/O never stalls tool calls.
+    log_queue: queue.Queue = queue.Queue(-1)
+    file_handler = logging.FileHandler("/tmp/prism-mcp.log")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[logging.FileHandler("/tmp/prism-mcp.log")],
+        handlers=[logging.handlers.QueueHandler(log_queue)],
     )
 
     logger.info("Starting Prism MCP Server (SDK mode)...")
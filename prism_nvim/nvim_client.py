@@ -4,10 +4,14 @@ Neovim RPC Client - Communicates with Neovim via msgpack-rpc
 This module provides a clean interface to control Neovim programmatically.
 """
 
+import errno
+import functools
 import os
+import selectors
 import socket
+import struct
+import time
 from dataclasses import dataclass, field
-from pathlib import Path
 from typing import Any, Optional
 
 # Try to import msgpack, fall back to pure Python implementation
@@ -19,6 +23,10 @@ except ImportError:
     HAS_MSGPACK = False
 
 
+# struct ucred {pid_t pid; uid_t uid; gid_t gid;} as returned by SO_PEERCRED
+_PEERCRED = struct.Struct("3i")
+
+
 def _path_matches(buf_name: str, path: str) -> bool:
     """Check if a buffer name matches a path.
 
@@ -36,7 +44,167 @@ def _path_matches(buf_name: str, path: str) -> bool:
     return False
 
 
-@dataclass
+@functools.lru_cache(maxsize=1024)
+def _norm_path(path: str) -> str:
+    """Expand ``~`` and collapse redundant separators (memoized)."""
+    if not path:
+        return path
+    return os.path.normpath(os.path.expanduser(path))
+
+
+# First window whose buffer has buftype "terminal", or nil
+_TERMINAL_WIN_LUA = """
+for _, win in ipairs(vim.api.nvim_list_wins()) do
+    if vim.bo[vim.api.nvim_win_get_buf(win)].buftype == "terminal" then
+        return win
+    end
+end
+return nil
+"""
+
+# First window showing neither a terminal nor a prism:// buffer, or nil
+_EDITOR_WIN_LUA = """
+for _, win in ipairs(vim.api.nvim_list_wins()) do
+    local buf = vim.api.nvim_win_get_buf(win)
+    if vim.bo[buf].buftype ~= "terminal"
+        and not vim.api.nvim_buf_get_name(buf):find("^prism://")
+    then
+        return win
+    end
+end
+return nil
+"""
+
+# Close a window (0 = current) unless it shows a terminal
+_CLOSE_WINDOW_LUA = """
+local win, force = ...
+if win == 0 then
+    win = vim.api.nvim_get_current_win()
+end
+if vim.bo[vim.api.nvim_win_get_buf(win)].buftype == "terminal" then
+    return false
+end
+vim.api.nvim_win_close(win, force)
+return true
+"""
+
+
+# Notify this client (channel 0 = the calling channel) whenever a buffer's
+# filetype or terminal channel may have changed. Only options whose changes
+# always fire an event are cached: FileType and TermOpen are triggered even
+# from inside other autocmds, while OptionSet (e.g. for buflisted) is not.
+_WATCH_BUF_OPTIONS_LUA = """
+local chan = vim.api.nvim_get_chan_info(0).id
+local group = vim.api.nvim_create_augroup("PrismBufOptions" .. chan, { clear = true })
+local function changed(ev)
+    if not pcall(vim.rpcnotify, chan, "prism_buf_changed", ev.buf) then
+        pcall(vim.api.nvim_del_augroup_by_id, group)
+    end
+end
+vim.api.nvim_create_autocmd({ "BufAdd", "BufDelete", "BufWipeout", "FileType", "TermOpen" }, {
+    group = group,
+    callback = changed,
+})
+return chan
+"""
+
+
+def _sockets_by_mtime(directory: str, prefix: str = "") -> list[str]:
+    """List <prefix>*.sock entries in directory, newest first.
+
+    One scandir pass; mtimes come from the entries' own stat results.
+    """
+    found = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(prefix) and name.endswith(".sock"):
+                    try:
+                        found.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+    except OSError:
+        return []
+    found.sort(reverse=True)
+    return [path for _, path in found]
+
+
+def _first_live_socket(candidates: list[str], timeout: float = 0.05) -> Optional[str]:
+    """Return the first candidate (in order) that accepts a connection.
+
+    All probes are started non-blocking and awaited together, so discovery
+    takes at most one short timeout instead of one per stale socket. A later
+    candidate that answers first only wins once every earlier one has failed
+    or the timeout has run out.
+    """
+    order = list(dict.fromkeys(candidates))
+    live = set()
+    pending = {}
+    sel = selectors.DefaultSelector()
+    try:
+        for path in order:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex(path)
+            if err == 0:
+                live.add(path)
+                sock.close()
+            elif err in (errno.EINPROGRESS, errno.EAGAIN):
+                pending[path] = sock
+                sel.register(sock, selectors.EVENT_WRITE, path)
+            else:
+                sock.close()
+
+        deadline = time.monotonic() + timeout
+        while pending:
+            # Done as soon as the best still-possible candidate is known live
+            best = next((p for p in order if p in live or p in pending), None)
+            if best in live:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                sock = pending.pop(key.data)
+                sel.unregister(sock)
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    live.add(key.data)
+                sock.close()
+    finally:
+        for sock in pending.values():
+            sock.close()
+        sel.close()
+
+    for path in order:
+        if path in live:
+            return path
+    return None
+
+
+# EXT type codes Neovim uses for Buffer, Window and Tabpage handles
+_HANDLE_EXT_TYPES = frozenset({0, 1, 2})
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    """Turn Buffer/Window/Tabpage handles into their plain int ids.
+
+    Neovim accepts ints wherever it expects a handle, and ints compare equal
+    to the ids carried by notifications such as prism_buf_changed.
+    """
+    if code in _HANDLE_EXT_TYPES:
+        return msgpack.unpackb(data)
+    return msgpack.ExtType(code, data)
+
+
+def _new_unpacker() -> "msgpack.Unpacker":
+    """Unpacker that decodes strings in C (invalid UTF-8 becomes U+FFFD)."""
+    return msgpack.Unpacker(
+        raw=False, strict_map_key=False, unicode_errors="replace", ext_hook=_decode_ext
+    )
+
+
+@dataclass(slots=True)
 class Buffer:
     """Represents a Neovim buffer."""
 
@@ -47,7 +215,7 @@ class Buffer:
     lines: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Window:
     """Represents a Neovim window."""
 
@@ -58,7 +226,7 @@ class Window:
     height: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Selection:
     """Represents a visual selection."""
 
@@ -91,14 +259,47 @@ class NeovimClient:
         self.socket: Optional[socket.socket] = None
         self.msgid = 0
         self._connected = False
+        # (address, peer pid) of the last successful discovery-based connect
+        self._verified: Optional[tuple[str, Optional[int]]] = None
 
         if not HAS_MSGPACK:
             raise ImportError(
                 "msgpack is required for Neovim RPC. " "Install it with: pip install msgpack"
             )
 
+        # Reused for every outgoing message. The client is used from one
+        # thread at a time, so the packer's internal buffer is never shared.
+        self._packer = msgpack.Packer(use_bin_type=True)
+        # Persistent read side: bytes past the awaited response stay buffered
+        # for the next call instead of being dropped with a per-call Unpacker
+        self._unpacker = _new_unpacker()
+        # Socket reads land here; feed() copies out, so the buffer is reused
+        self._recv_buf = bytearray(65536)
+        self._recv_view = memoryview(self._recv_buf)
+        # buf_id -> {option: value} for options Neovim reports changes to;
+        # only used while the invalidation autocmds are installed
+        self._buf_options: dict[int, dict[str, Any]] = {}
+        self._watching_buf_options = False
+
     def connect(self) -> bool:
         """Connect to Neovim."""
+        # Reconnect straight to the instance found last time, skipping
+        # discovery, as long as the same Neovim process still owns the socket
+        if not self.address and self._verified is not None:
+            address, pid = self._verified
+            self._verified = None
+            try:
+                self._open(address)
+                if pid is None or self._peer_pid() == pid:
+                    self._verified = (address, pid)
+                    self._start_session()
+                    return True
+            except OSError:
+                pass
+            # Dead socket or a different process now owns it: close it
+            # before falling back to discovery
+            self.disconnect()
+
         address = self.address
 
         if not address:
@@ -120,26 +321,49 @@ class NeovimClient:
             )
 
         try:
-            if address.startswith("/") or address.startswith("\\"):
-                # Unix socket
-                self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                self.socket.connect(address)
-            elif ":" in address:
-                # TCP socket
-                host, port = address.rsplit(":", 1)
-                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.socket.connect((host, int(port)))
-            else:
-                # Assume Unix socket
-                self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                self.socket.connect(address)
-
-            self._connected = True
+            self._open(address)
+            self._verified = (address, self._peer_pid())
+            self._start_session()
             return True
 
         except Exception as e:
+            self.disconnect()
             raise ConnectionError(f"Failed to connect to Neovim at {address}: {e}")
 
+    def _open(self, address: str) -> None:
+        """Open the socket to address (Unix path or host:port)."""
+        if address.startswith("/") or address.startswith("\\"):
+            # Unix socket
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(address)
+        elif ":" in address:
+            # TCP socket
+            host, port = address.rsplit(":", 1)
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.connect((host, int(port)))
+            # Small request/response RPCs: don't let Nagle or delayed ACKs hold them
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, "TCP_QUICKACK"):
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        else:
+            # Assume Unix socket
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(address)
+
+    def _peer_pid(self) -> Optional[int]:
+        """PID of the process on the other end of a Unix socket (Linux only)."""
+        if not hasattr(socket, "SO_PEERCRED") or self.socket.family != socket.AF_UNIX:
+            return None
+        creds = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size)
+        return _PEERCRED.unpack(creds)[0]
+
+    def _start_session(self) -> None:
+        """Reset per-connection state on a freshly opened socket."""
+        # Fresh stream, fresh framing state
+        self._unpacker = _new_unpacker()
+        self._connected = True
+        self._watch_buffer_options()
+
     def _find_nvim_socket(self) -> Optional[str]:
         """Try to find a running Neovim socket."""
         # Check common locations
@@ -150,32 +374,15 @@ class NeovimClient:
         ]
 
         # Check for PID-based sockets (nvim-<pid>.sock)
-        import glob
-
-        pid_sockets = sorted(glob.glob("/tmp/nvim-*.sock"), key=os.path.getmtime, reverse=True)
-        candidates = pid_sockets + candidates
+        candidates = _sockets_by_mtime("/tmp", "nvim-") + candidates
 
         # Check XDG runtime dir
         xdg_runtime = os.environ.get("XDG_RUNTIME_DIR")
         if xdg_runtime:
-            nvim_dir = Path(xdg_runtime) / "nvim"
-            if nvim_dir.exists():
-                for sock in nvim_dir.glob("*.sock"):
-                    candidates.insert(0, str(sock))
-
-        for candidate in candidates:
-            if os.path.exists(candidate):
-                # Verify socket is actually usable
-                try:
-                    test_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                    test_sock.settimeout(0.5)
-                    test_sock.connect(candidate)
-                    test_sock.close()
-                    return candidate
-                except Exception:
-                    continue
-
-        return None
+            candidates = _sockets_by_mtime(os.path.join(xdg_runtime, "nvim")) + candidates
+
+        # Verify sockets are actually usable, probing all of them at once
+        return _first_live_socket([c for c in candidates if os.path.exists(c)])
 
     def disconnect(self):
         """Disconnect from Neovim."""
@@ -188,47 +395,144 @@ class NeovimClient:
         """Check if connected to Neovim."""
         return self._connected and self.socket is not None
 
-    def _decode_bytes(self, obj: Any) -> Any:
-        """Recursively decode bytes to strings in nested structures."""
-        if isinstance(obj, bytes):
-            return obj.decode("utf-8", errors="replace")
-        elif isinstance(obj, list):
-            return [self._decode_bytes(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {self._decode_bytes(k): self._decode_bytes(v) for k, v in obj.items()}
-        return obj
+    def _watch_buffer_options(self) -> None:
+        """Install the autocmds that keep the buffer option cache honest."""
+        self._buf_options.clear()
+        try:
+            self.lua(_WATCH_BUF_OPTIONS_LUA)
+            self._watching_buf_options = True
+        except RuntimeError:
+            # Older Neovim without the needed API: fetch options every time
+            self._watching_buf_options = False
+
+    def _handle_notification(self, message: list) -> None:
+        """Apply a notification from Neovim that arrived between responses."""
+        _, method, args = message
+        if method == "prism_buf_changed" and args:
+            self._buf_options.pop(args[0], None)
+
+    def _get_buf_options(self, buf_ids: list[int], option: str) -> list:
+        """Get one option for several buffers, serving cached values."""
+        if not self._watching_buf_options:
+            return self.pipeline([("nvim_buf_get_option", [b, option]) for b in buf_ids])
+        cache = self._buf_options
+        missing = [b for b in buf_ids if option not in cache.get(b, ())]
+        if missing:
+            values = self.pipeline([("nvim_buf_get_option", [b, option]) for b in missing])
+            for buf_id, value in zip(missing, values):
+                cache.setdefault(buf_id, {})[option] = value
+        return [cache[b][option] for b in buf_ids]
+
+    def _recv_more(self) -> None:
+        """Read whatever is available (up to 64 KiB) into the unpacker."""
+        n = self.socket.recv_into(self._recv_buf)
+        if not n:
+            raise ConnectionError("Connection closed by Neovim")
+        self._unpacker.feed(self._recv_view[:n])
 
     def _send(self, msg_type: int, method: str, args: list) -> Any:
         """Send an RPC message and get response."""
-        if not self.is_connected():
+        if not self._connected or self.socket is None:
             self.connect()
 
-        self.msgid += 1
-        msg = [msg_type, self.msgid, method, args]
-
-        packed = msgpack.packb(msg)
-        self.socket.sendall(packed)
+        # Hot path for every RPC: attribute lookups hoisted into locals
+        msgid = self.msgid = self.msgid + 1
+        self.socket.sendall(self._packer.pack([msg_type, msgid, method, args]))
 
         # Read response
-        # Use raw=True and decode manually to handle all edge cases
-        unpacker = msgpack.Unpacker(raw=True)
+        unpacker = self._unpacker
         while True:
-            data = self.socket.recv(4096)
-            if not data:
-                raise ConnectionError("Connection closed by Neovim")
-            unpacker.feed(data)
             for response in unpacker:
-                if response[0] == 1 and response[1] == self.msgid:
-                    error, result = response[2], response[3]
+                kind = response[0]
+                if kind == 1 and response[1] == msgid:
+                    error = response[2]
                     if error:
-                        error = self._decode_bytes(error)
                         raise RuntimeError(f"Neovim error: {error}")
-                    return self._decode_bytes(result)
+                    return response[3]
+                if kind == 2:
+                    self._handle_notification(response)
+            self._recv_more()
 
     def call(self, method: str, *args) -> Any:
         """Call a Neovim API method."""
         return self._send(0, method, list(args))
 
+    def notify_oneway(self, method: str, *args) -> None:
+        """Send a msgpack-rpc notification: no msgid, no reply awaited.
+
+        Errors are not reported back; Neovim may emit an nvim_error_event,
+        which the next request's read loop skips.
+        """
+        if not self.is_connected():
+            self.connect()
+        self.socket.sendall(self._packer.pack([2, method, list(args)]))
+
+    def pipeline(self, calls: list[tuple[str, list]]) -> list:
+        """Send several requests in one write and collect their responses.
+
+        Unlike call_atomic, each call is an independent request with its own
+        msgid; Neovim answers them in order and all replies are drained
+        before the first error (if any) is raised.
+
+        Args:
+            calls: List of (method, args) pairs
+
+        Returns:
+            Results in the same order as calls.
+        """
+        if not calls:
+            return []
+        if not self.is_connected():
+            self.connect()
+
+        first = self.msgid + 1
+        self.msgid += len(calls)
+        last = self.msgid
+        pack = self._packer.pack
+        self.socket.sendall(
+            b"".join(
+                pack([0, first + i, method, list(args)]) for i, (method, args) in enumerate(calls)
+            )
+        )
+
+        responses = {}
+        unpacker = self._unpacker
+        while len(responses) < len(calls):
+            for response in unpacker:
+                if response[0] == 2:
+                    self._handle_notification(response)
+                elif response[0] == 1 and first <= response[1] <= last:
+                    responses[response[1]] = response
+                    if len(responses) == len(calls):
+                        break
+            else:
+                self._recv_more()
+
+        results = []
+        for (method, _), msgid in zip(calls, range(first, last + 1)):
+            error, result = responses[msgid][2], responses[msgid][3]
+            if error:
+                raise RuntimeError(f"Neovim error in {method}: {error}")
+            results.append(result)
+        return results
+
+    def call_atomic(self, calls: list) -> list:
+        """Run several API calls in a single RPC via nvim_call_atomic.
+
+        Args:
+            calls: List of [method, args] pairs
+
+        Returns:
+            Results in the same order as calls.
+        """
+        if not calls:
+            return []
+        results, error = self.call("nvim_call_atomic", calls)
+        if error:
+            index, _, message = error
+            raise RuntimeError(f"Neovim error in {calls[index][0]}: {message}")
+        return results
+
     def command(self, cmd: str) -> None:
         """Execute a Neovim command."""
         self.call("nvim_command", cmd)
@@ -257,30 +561,43 @@ class NeovimClient:
     def get_buffers(self) -> list[Buffer]:
         """Get all listed buffers."""
         buf_ids = self.call("nvim_list_bufs")
-        buffers = []
-        for buf_id in buf_ids:
-            if self.call("nvim_buf_get_option", buf_id, "buflisted"):
-                buffers.append(self._get_buffer_info(buf_id))
-        return buffers
+        # Not cached: 'buflisted' often changes without an event we can watch
+        listed = self.pipeline([("nvim_buf_get_option", [b, "buflisted"]) for b in buf_ids])
+        return self._get_buffer_infos([b for b, is_listed in zip(buf_ids, listed) if is_listed])
 
     def _get_buffer_info(self, buf_id: int) -> Buffer:
         """Get buffer information."""
-        name = self.call("nvim_buf_get_name", buf_id)
-        filetype = self.call("nvim_buf_get_option", buf_id, "filetype")
-        modified = self.call("nvim_buf_get_option", buf_id, "modified")
-        return Buffer(
-            id=buf_id,
-            name=name,
-            filetype=filetype,
-            modified=modified,
+        return self._get_buffer_infos([buf_id])[0]
+
+    def _get_buffer_infos(self, buf_ids: list[int]) -> list[Buffer]:
+        """Get information for several buffers in one pipelined round trip."""
+        filetypes = self._get_buf_options(buf_ids, "filetype")
+        # Name and modified flag change without a cheap event; always fetch
+        results = self.pipeline(
+            [
+                call
+                for buf_id in buf_ids
+                for call in (
+                    ("nvim_buf_get_name", [buf_id]),
+                    ("nvim_buf_get_option", [buf_id, "modified"]),
+                )
+            ]
         )
+        return [
+            Buffer(id=buf_id, name=name, filetype=filetype, modified=modified)
+            for buf_id, name, filetype, modified in zip(
+                buf_ids, results[0::2], filetypes, results[1::2]
+            )
+        ]
 
     def get_buffer_content(self, buf_id: Optional[int] = None) -> str:
         """Get the content of a buffer."""
-        if buf_id is None:
-            buf_id = self.call("nvim_get_current_buf")
-        lines = self.call("nvim_buf_get_lines", buf_id, 0, -1, False)
-        return "\n".join(lines)
+        # Joined inside Neovim: one string on the wire, no join in Python.
+        # Buffer 0 is the current buffer, so this is always a single RPC.
+        return self.lua(
+            "return table.concat(vim.api.nvim_buf_get_lines(..., 0, -1, false), '\\n')",
+            buf_id or 0,
+        )
 
     def set_buffer_content(self, content: str, buf_id: Optional[int] = None) -> None:
         """Set the content of a buffer."""
@@ -317,24 +634,11 @@ class NeovimClient:
 
     def _find_editor_window(self) -> Optional[int]:
         """Find a non-terminal window suitable for editing."""
-        windows = self.call("nvim_list_wins")
-        for win in windows:
-            buf = self.call("nvim_win_get_buf", win)
-            buftype = self.call("nvim_get_option_value", "buftype", {"buf": buf})
-            bufname = self.call("nvim_buf_get_name", buf)
-            if buftype != "terminal" and not bufname.startswith("prism://"):
-                return win
-        return None
+        return self.lua(_EDITOR_WIN_LUA)
 
     def _find_terminal_window(self) -> Optional[int]:
         """Find the terminal window."""
-        windows = self.call("nvim_list_wins")
-        for win in windows:
-            buf = self.call("nvim_win_get_buf", win)
-            buftype = self.call("nvim_get_option_value", "buftype", {"buf": buf})
-            if buftype == "terminal":
-                return win
-        return None
+        return self.lua(_TERMINAL_WIN_LUA)
 
     def _return_to_terminal(self) -> bool:
         """Return focus to terminal window."""
@@ -385,6 +689,7 @@ class NeovimClient:
         """
         if filepath:
             # Find buffer by path and save it directly
+            filepath = _norm_path(filepath)
             for buf in self.get_buffers():
                 if _path_matches(buf.name, filepath):
                     # Switch to editor window, save buffer, switch back
@@ -396,8 +701,8 @@ class NeovimClient:
                         self.command("write")
                         self.call("nvim_set_current_win", current_win)
                     else:
-                        # No editor window, just try to write the buffer
-                        self.command(f"silent! buffer {buf.id} | write | buffer #")
+                        # No editor window, write the buffer in place
+                        self.write_buffer(buf.id)
                     return True
             # Buffer not found - file might not be open, nothing to save
             return False
@@ -413,6 +718,17 @@ class NeovimClient:
                 self.command("write")
             return True
 
+    def write_buffer(self, buf_id: int) -> None:
+        """Write a buffer to disk without switching windows or buffers.
+
+        Uses nvim_buf_call in a single RPC, so no ex command string is built
+        or parsed and the user's current buffer is left untouched.
+        """
+        self.lua(
+            "local buf = ...; vim.api.nvim_buf_call(buf, function() vim.cmd('write') end)",
+            buf_id,
+        )
+
     def close_buffer(self, buf_id: Optional[int] = None, force: bool = False) -> None:
         """Close a buffer."""
         if buf_id is None:
@@ -432,21 +748,38 @@ class NeovimClient:
     def get_windows(self) -> list[Window]:
         """Get all windows."""
         win_ids = self.call("nvim_list_wins")
-        return [self._get_window_info(wid) for wid in win_ids]
+        return self._get_window_infos(win_ids)
 
     def _get_window_info(self, win_id: int) -> Window:
         """Get window information."""
-        buf_id = self.call("nvim_win_get_buf", win_id)
-        cursor = self.call("nvim_win_get_cursor", win_id)
-        width = self.call("nvim_win_get_width", win_id)
-        height = self.call("nvim_win_get_height", win_id)
-        return Window(
-            id=win_id,
-            buffer_id=buf_id,
-            cursor=tuple(cursor),
-            width=width,
-            height=height,
+        return self._get_window_infos([win_id])[0]
+
+    def _get_window_infos(self, win_ids: list[int]) -> list[Window]:
+        """Get information for several windows in one pipelined round trip."""
+        results = self.pipeline(
+            [
+                (method, [win_id])
+                for win_id in win_ids
+                for method in (
+                    "nvim_win_get_buf",
+                    "nvim_win_get_cursor",
+                    "nvim_win_get_width",
+                    "nvim_win_get_height",
+                )
+            ]
         )
+        return [
+            Window(
+                id=win_id,
+                buffer_id=buf_id,
+                cursor=tuple(cursor),
+                width=width,
+                height=height,
+            )
+            for win_id, buf_id, cursor, width, height in zip(
+                win_ids, results[0::4], results[1::4], results[2::4], results[3::4]
+            )
+        ]
 
     def split(self, vertical: bool = False, filepath: Optional[str] = None) -> Window:
         """Create a new split."""
@@ -458,29 +791,12 @@ class NeovimClient:
 
     def close_window(self, win_id: Optional[int] = None, force: bool = False) -> None:
         """Close a window. Never closes terminal windows."""
-        if win_id:
-            # Check if it's a terminal - never close terminals
-            buf = self.call("nvim_win_get_buf", win_id)
-            buftype = self.call("nvim_get_option_value", "buftype", {"buf": buf})
-            if buftype == "terminal":
-                return  # Refuse to close terminal
-            self.call("nvim_win_close", win_id, force)
-        else:
-            # Check current window
-            buf = self.call("nvim_get_current_buf")
-            buftype = self.call("nvim_get_option_value", "buftype", {"buf": buf})
-            if buftype == "terminal":
-                return  # Refuse to close terminal
-            self.command("close!" if force else "close")
+        # Terminal check and close happen in one RPC
+        self.lua(_CLOSE_WINDOW_LUA, win_id or 0, force)
 
     def get_terminal_window(self) -> Optional[int]:
         """Find the terminal window. Returns window ID or None."""
-        for win in self.call("nvim_list_wins"):
-            buf = self.call("nvim_win_get_buf", win)
-            buftype = self.call("nvim_get_option_value", "buftype", {"buf": buf})
-            if buftype == "terminal":
-                return win
-        return None
+        return self._find_terminal_window()
 
     def ensure_terminal_visible(self) -> None:
         """Ensure terminal window exists and is visible."""
@@ -720,8 +1036,9 @@ class NeovimClient:
 
     def send_to_terminal(self, text: str, buf_id: int) -> None:
         """Send text to a terminal buffer."""
-        # Get the terminal channel
-        channel = self.call("nvim_buf_get_option", buf_id, "channel")
+        # Terminal channel is cached with the other buffer options and
+        # dropped when the buffer is deleted or a new job opens in it
+        channel = self._get_buf_options([buf_id], "channel")[0]
         self.call("nvim_chan_send", channel, text)
 
     # =========================================================================
@@ -730,23 +1047,19 @@ class NeovimClient:
 
     def notify(self, message: str, level: str = "info") -> None:
         """Show a notification in Neovim."""
-        levels = {
-            "error": "vim.log.levels.ERROR",
-            "warn": "vim.log.levels.WARN",
-            "info": "vim.log.levels.INFO",
-            "debug": "vim.log.levels.DEBUG",
-        }
-        vim_level = levels.get(level, "vim.log.levels.INFO")
-        self.lua(f"vim.notify(..., {vim_level})", message)
+        # vim.log.levels values; nvim_notify forwards to vim.notify
+        levels = {"error": 4, "warn": 3, "info": 2, "debug": 1}
+        self.notify_oneway("nvim_notify", message, levels.get(level, 2), {})
 
     def echo(self, message: str) -> None:
         """Echo a message in the command line."""
-        self.command(f'echo "{message}"')
+        # Text is passed as msgpack values, so no quoting and no Ex parsing
+        self.call("nvim_echo", [[message, ""]], False, {})
 
     def input(self, prompt: str) -> str:
         """Get input from the user."""
-        return self.eval(f'input("{prompt}")')
+        return self.func("input", prompt)
 
     def confirm(self, message: str, choices: str = "&Yes\n&No") -> int:
         """Show a confirmation dialog. Returns choice number (1-indexed)."""
-        return self.eval(f'confirm("{message}", "{choices}")')
+        return self.func("confirm", message, choices)
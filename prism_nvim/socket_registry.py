@@ -7,43 +7,75 @@ Robust approach:
 3. Works with multiple concurrent Neovim instances
 """
 
+import functools
 import json
 import os
+import subprocess
 import time
 from pathlib import Path
 from typing import Optional
 
+# orjson is an optional speedup for parsing the registry
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 REGISTRY_PATH = Path("/tmp/prism-socket-registry.json")
 
+# Last parsed registry, keyed by the file's (inode, mtime_ns, size). Writers
+# rename a new file into place, so the inode changes even when a same-size
+# rewrite lands within the filesystem's mtime granularity.
+_registry_cache: Optional[tuple[tuple[int, int, int], dict]] = None
+
 
 def get_process_ancestors() -> list[int]:
     """Get list of ancestor PIDs (self, parent, grandparent, ...)."""
+    return list(_ancestors_of(os.getpid()))
+
+
+@functools.lru_cache(maxsize=4)
+def _ancestors_of(pid: int) -> tuple[int, ...]:
+    """Walk the parent chain of pid once (memoized; it doesn't change for us)."""
     ancestors = []
-    pid = os.getpid()
+
+    if not os.path.exists(f"/proc/{pid}/stat"):
+        # macOS fallback: one ps call for the whole table, walked in Python
+        parents = _ps_parent_map()
+        while pid > 1 and pid not in ancestors:
+            ancestors.append(pid)
+            if pid not in parents:
+                break
+            pid = parents[pid]
+        return tuple(ancestors)
 
     while pid > 1:
         ancestors.append(pid)
         try:
-            # Read parent PID from /proc or use ps
-            if os.path.exists(f"/proc/{pid}/stat"):
-                with open(f"/proc/{pid}/stat") as f:
-                    parts = f.read().split()
-                    pid = int(parts[3])  # ppid is 4th field
-            else:
-                # macOS fallback
-                import subprocess
-
-                result = subprocess.run(
-                    ["ps", "-o", "ppid=", "-p", str(pid)], capture_output=True, text=True
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    pid = int(result.stdout.strip())
-                else:
-                    break
+            # Read parent PID from /proc
+            with open(f"/proc/{pid}/stat") as f:
+                # comm (field 2) may contain spaces; ppid follows the closing paren
+                pid = int(f.read().rsplit(")", 1)[1].split()[1])
         except (FileNotFoundError, ValueError, IndexError):
             break
 
-    return ancestors
+    return tuple(ancestors)
+
+
+def _ps_parent_map() -> dict[int, int]:
+    """Map every PID to its parent PID using a single ps invocation."""
+    try:
+        result = subprocess.run(["ps", "-eo", "pid=,ppid="], capture_output=True, text=True)
+    except FileNotFoundError:
+        return {}
+    parents = {}
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[0].isdigit() and fields[1].isdigit():
+            parents[int(fields[0])] = int(fields[1])
+    return parents
 
 
 def register_socket(nvim_pid: int, socket_path: str) -> None:
@@ -107,23 +139,59 @@ def find_socket() -> Optional[str]:
 
 
 def load_registry() -> dict:
-    """Load the socket registry."""
-    if REGISTRY_PATH.exists():
-        try:
-            with open(REGISTRY_PATH) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
-    return {}
+    """Load the socket registry.
+
+    The parsed file is reused until its inode, mtime or size changes; callers
+    get a shallow copy they are free to modify.
+    """
+    global _registry_cache
+    try:
+        st = REGISTRY_PATH.stat()
+    except OSError:
+        return {}
+
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    if _registry_cache is not None and _registry_cache[0] == key:
+        return dict(_registry_cache[1])
+
+    try:
+        data = REGISTRY_PATH.read_bytes()
+        registry = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+    except (ValueError, IOError):
+        return {}
+    if not isinstance(registry, dict):
+        return {}
+
+    _registry_cache = (key, registry)
+    return dict(registry)
 
 
 def save_registry(registry: dict) -> None:
-    """Save the socket registry."""
+    """Save the socket registry.
+
+    Written to a per-process temp file and renamed into place, so concurrent
+    readers see either the old or the new registry, never a partial one.
+    """
+    global _registry_cache
+    if HAS_ORJSON:
+        data = orjson.dumps(registry)
+    else:
+        data = json.dumps(registry, separators=(",", ":")).encode()
+
+    tmp = REGISTRY_PATH.with_name(f"{REGISTRY_PATH.name}.{os.getpid()}.tmp")
     try:
-        with open(REGISTRY_PATH, "w") as f:
-            json.dump(registry, f, indent=2)
-    except IOError:
-        pass
+        tmp.write_bytes(data)
+        # Stat our own file: after the rename, REGISTRY_PATH may already be
+        # another writer's. A rename keeps inode, mtime and size.
+        st = tmp.stat()
+        os.replace(tmp, REGISTRY_PATH)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return
+    _registry_cache = ((st.st_ino, st.st_mtime_ns, st.st_size), dict(registry))
 
 
 def clean_registry(registry: dict) -> None:
@@ -1,94 +1,440 @@
 #!/usr/bin/env python3
 """
 Prism.nvim Installer - Claude-centric installation
-Run with: python3 install.py
+Run with: python3 install.py [--in-place] [--offline | --skip-git | --skip-pip]
 """
 
+import argparse
+import hashlib
+import importlib.util
 import json
+import mmap
 import os
+import re
+import shutil
 import subprocess
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
-# Colors
-GREEN = "\033[92m"
-YELLOW = "\033[93m"
-BLUE = "\033[94m"
-RED = "\033[91m"
-NC = "\033[0m"
+# orjson is an optional speedup for reading/writing settings.json
+try:
+    import orjson
 
-def info(msg): print(f"{GREEN}[+]{NC} {msg}")
-def warn(msg): print(f"{YELLOW}[!]{NC} {msg}")
-def step(msg): print(f"{BLUE}[>]{NC} {msg}")
-def error(msg): print(f"{RED}[x]{NC} {msg}"); sys.exit(1)
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-def run(cmd, check=True):
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+# pygit2 lets updates skip spawning a shell and git; subprocess otherwise
+try:
+    import pygit2
+
+    HAS_PYGIT2 = True
+except ImportError:
+    HAS_PYGIT2 = False
+
+# Colors (dropped when output goes to a pipe or log file)
+if sys.stdout.isatty():
+    GREEN = "\033[92m"
+    YELLOW = "\033[93m"
+    BLUE = "\033[94m"
+    RED = "\033[91m"
+    NC = "\033[0m"
+else:
+    GREEN = YELLOW = BLUE = RED = NC = ""
+
+INFO_PFX = f"{GREEN}[+]{NC} "
+WARN_PFX = f"{YELLOW}[!]{NC} "
+STEP_PFX = f"{BLUE}[>]{NC} "
+ERROR_PFX = f"{RED}[x]{NC} "
+
+REPO_URL = "https://github.com/genomewalker/prism.nvim.git"
+
+# dir lines the installer writes into prism.lua: installed copy or checkout
+GENERATED_DIR_LINE = re.compile(
+    rb'^  dir = (?:vim\.fn\.expand\("~/\.local/share/prism\.nvim"\)|\[(=*)\[[^\n]*\]\1\]),$', re.M
+)
+
+# Delimit the instructions block written to CLAUDE.md
+PRISM_BEGIN = "<!-- prism:begin -->"
+PRISM_END = "<!-- prism:end -->"
+# Block older installers wrote without markers, from its heading through
+# its last line; whatever the user wrote after it is kept
+LEGACY_SECTION = re.compile(
+    r"^# Prism\.nvim MCP Integration\n.*?"
+    r"^\*\*Check connection\*\*: `mcp__prism-nvim__get_current_file`\n?",
+    re.M | re.S,
+)
+
+ALIASES_MARKER = b"# Prism.nvim helpers"
+ALIASES = b'''
+# Prism.nvim helpers
+alias nvc='CLAUDE_ARGS="--continue" nvim'
+alias nvco='CLAUDE_ARGS="--model opus" nvim'
+alias nvcs='CLAUDE_ARGS="--model sonnet" nvim'
+'''
+
+HEADER = """
+  ╔═══════════════════════════════════════╗
+  ║         Prism.nvim Installer          ║
+  ║   Claude Code + Neovim Integration    ║
+  ╚═══════════════════════════════════════╝
+
+"""
+
+BANNER = """
+  ╔═══════════════════════════════════════╗
+  ║        Installation Complete!         ║
+  ╚═══════════════════════════════════════╝
+
+  Next steps:
+
+    1. Restart Claude Code (to load MCP)
+    2. Open Neovim
+    3. Press Ctrl+; to toggle Claude
+
+  Keybindings:
+    Ctrl+;           Toggle Claude terminal
+    Ctrl+\\ Ctrl+\\    Exit terminal mode
+    <leader>cs       Send to Claude
+
+  Token savings: Claude now uses MCP for 10-50x fewer tokens!
+
+"""
+
+# The MCP server runs under the interpreter that got msgpack, not whatever
+# "python3" resolves to on PATH
+PYTHON = sys.executable
+
+def info(msg): sys.stdout.write(INFO_PFX + msg + "\n")
+def warn(msg): sys.stdout.write(WARN_PFX + msg + "\n")
+def step(msg): sys.stdout.write(STEP_PFX + msg + "\n")
+def error(msg): sys.stdout.write(ERROR_PFX + msg + "\n"); sys.exit(1)
+
+def run(cmd, check=True, cwd=None, stream=False):
+    """Run an argv list directly (no intermediate shell).
+
+    With stream=True stderr goes straight to the terminal, so long commands
+    show progress live instead of buffering it all until they exit.
+    """
+    if stream:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, cwd=cwd)
+    else:
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
     if check and result.returncode != 0:
-        error(f"Command failed: {cmd}\n{result.stderr}")
+        error(f"Command failed: {' '.join(cmd)}\n{result.stderr or ''}")
     return result
 
-def main():
-    print()
-    print("  ╔═══════════════════════════════════════╗")
-    print("  ║         Prism.nvim Installer          ║")
-    print("  ║   Claude Code + Neovim Integration    ║")
-    print("  ╚═══════════════════════════════════════╝")
-    print()
+def run_batch(cmds, check=True, cwd=None, args=()):
+    """Run several dependent shell commands in one shell (one process spawn).
+
+    Values go in args and are referenced as "$1", "$2", ... so nothing is
+    interpolated into the script text.
+    """
+    return run(["/bin/sh", "-c", " && ".join(cmds), "sh", *args], check, cwd)
+
+def load_json(data):
+    """Parse JSON bytes."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+def dump_json(obj):
+    """Serialize obj to indented JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def ensure_dirs(*dirs):
+    """Create missing directories; an existing one costs a single stat.
+
+    Directories that are ancestors of another entry are left to that
+    entry's mkdir(parents=True).
+    """
+    for d in dirs:
+        if any(other != d and other.is_relative_to(d) for other in dirs):
+            continue
+        try:
+            os.stat(d)
+        except FileNotFoundError:
+            d.mkdir(parents=True, exist_ok=True)
+
+def safe_write(path, data):
+    """Replace path with data (bytes) without ever leaving a partial file.
+
+    Temp file -> fsync -> verify -> rename over path -> fsync the directory.
+    A symlinked path (dotfile managers) is written through to its target.
+    """
+    path = path.resolve()
+    tmp = path.with_name(path.name + ".tmp")
+    mode = path.stat().st_mode & 0o777 if path.exists() else 0o644
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    except FileExistsError:
+        # Left behind by an interrupted run
+        tmp.unlink()
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if hashlib.sha256(tmp.read_bytes()).digest() != hashlib.sha256(data).digest():
+            error(f"Verification failed writing {path}")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+def pygit2_update(prism_dir):
+    """Fast-forward a shallow installer checkout to its upstream tip in-process.
+
+    Returns False when the checkout isn't one pygit2 should touch (full
+    clone, detached HEAD, no upstream) or this pygit2 is too old, so the
+    caller falls back to the git CLI.
+    """
+    try:
+        repo = pygit2.Repository(str(prism_dir))
+        if not repo.is_shallow or repo.head_is_detached:
+            return False
+        upstream = repo.branches.local[repo.head.shorthand].upstream
+        if upstream is None:
+            return False
+        repo.remotes[upstream.remote_name].fetch(depth=1)
+        tip = repo.lookup_reference(upstream.name).target
+        repo.reset(tip, pygit2.enums.ResetMode.HARD)
+    except (pygit2.GitError, KeyError, TypeError, AttributeError):
+        return False
+    return True
+
+def sync_repo(prism_dir):
+    """Step 1: clone or update the repository."""
+    ref = os.environ.get("PRISM_REF")
+    if prism_dir.exists():
+        # PRISM_REF may name a tag or commit; leave that to git fetch
+        if HAS_PYGIT2 and not ref and pygit2_update(prism_dir):
+            return ["Updated existing installation"]
+        # Installer-made shallow clone: fetch just the new tip and move to it.
+        # Full clone (likely a developer checkout): never discard local work.
+        run_batch(
+            [
+                'if [ "$(git rev-parse --is-shallow-repository)" = true ]; then'
+                ' git fetch --depth=1 origin "$1" && git reset --hard FETCH_HEAD;'
+                " else git pull --ff-only; fi",
+            ],
+            check=False,
+            cwd=prism_dir,
+            args=(ref or "HEAD",),
+        )
+        return ["Updated existing installation"]
+
+    # Only the working tree is needed: single commit, blobs fetched on demand
+    branch = ["--branch", ref] if ref else []
+    cmd = ["git", "clone", "--depth=1", "--filter=blob:none", "--single-branch", *branch,
+           REPO_URL, str(prism_dir)]
+    # Runs on a worker thread: report failure to main() rather than exiting here
+    if run(cmd, check=False, stream=True).returncode != 0:
+        raise RuntimeError(f"Command failed: {' '.join(cmd)}")
+    return ["Cloned prism.nvim"]
+
+def script_checkout():
+    """Checkout this script ships in (skills/prism/install.py), or None.
+
+    None when run standalone: copied elsewhere or piped in on stdin.
+    """
+    script = globals().get("__file__")
+    if not script or script == "<stdin>":
+        return None
+    path = Path(script).resolve()
+    if len(path.parents) > 2 and path.parent.name == "prism" and path.parents[1].name == "skills":
+        return path.parents[2]
+    return None
+
+def is_prism_checkout(path):
+    """True if path is a git checkout whose origin is the prism.nvim repo."""
+    if not (path / ".git").exists():
+        return False
+    url = run(
+        ["git", "config", "-f", str(path / ".git/config"), "--get", "remote.origin.url"],
+        check=False,
+    ).stdout.strip()
+    # Accept https and ssh forms, with or without the .git suffix
+    return url.removesuffix("/").removesuffix(".git").endswith("genomewalker/prism.nvim")
+
+def lua_string(path):
+    """path as a Lua long-bracket literal, which has no escapes to get wrong."""
+    raw = os.fsencode(path)
+    level = b""
+    # Pick a level whose closing bracket can't occur in (or end) the path
+    while b"]" + level + b"]" in raw + b"]":
+        level += b"="
+    return b"[" + level + b"[" + raw + b"]" + level + b"]"
+
+def strip_legacy_instructions(content):
+    """Remove the unmarked instructions section older installers appended.
+
+    Matched from its heading to its closing "Check connection" line, so
+    copies the user edited or that older installers worded differently
+    still go.
+    """
+    return LEGACY_SECTION.sub("", content)
+
+def install_deps():
+    """Step 2: Python dependencies."""
+    # pip targets this same interpreter, so an in-process lookup is enough
+    if importlib.util.find_spec("msgpack") is not None:
+        return ["msgpack already installed"]
+    # Captured, not streamed: only the clone may write to the terminal live
+    result = run([PYTHON, "-m", "pip", "install", "--user", "--quiet", "msgpack"], check=False)
+    return ["msgpack installed", *result.stderr.splitlines()]
+
+def add_aliases(home):
+    """Step 7: shell aliases."""
+    shell_rc = home / ".zshrc" if (home / ".zshrc").exists() else home / ".bashrc"
+
+    try:
+        fd = os.open(shell_rc, os.O_RDONLY)
+    except FileNotFoundError:
+        return []
+    try:
+        # The helpers are only ever appended, so on re-runs they sit at the
+        # tail; fall back to scanning the whole file without decoding it
+        size = os.fstat(fd).st_size
+        found = ALIASES_MARKER in os.pread(fd, min(size, 4096), max(0, size - 4096))
+        if not found and size > 4096:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as m:
+                found = m.find(ALIASES_MARKER) != -1
+    finally:
+        os.close(fd)
+    if found:
+        return ["Shell aliases already configured"]
+
+    fd = os.open(shell_rc, os.O_WRONLY | os.O_APPEND)
+    try:
+        os.write(fd, ALIASES)
+    finally:
+        os.close(fd)
+    return [f"Added aliases to {shell_rc}"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Install prism.nvim for Claude Code")
+    parser.add_argument(
+        "--in-place",
+        action="store_true",
+        help="use the checkout this script lives in instead of cloning",
+    )
+    parser.add_argument(
+        "--skip-git",
+        action="store_true",
+        help="don't clone or update the repository (it must already be installed)",
+    )
+    parser.add_argument("--skip-pip", action="store_true", help="don't install Python dependencies")
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="skip every network step (same as --skip-git --skip-pip)",
+    )
+    args = parser.parse_args(argv)
+    skip_git = args.offline or args.skip_git
+    skip_pip = args.offline or args.skip_pip
+
+    sys.stdout.write(HEADER)
 
     home = Path.home()
     prism_dir = home / ".local/share/prism.nvim"
+    # Running from some other prism.nvim checkout: install that, don't
+    # re-clone. The installed copy itself still gets the normal update.
+    checkout = script_checkout()
+    in_place = args.in_place or (
+        checkout is not None and checkout != prism_dir.resolve() and is_prism_checkout(checkout)
+    )
+    if in_place:
+        if checkout is None or not (checkout / ".git").exists():
+            error("--in-place: this script is not inside a prism.nvim git checkout")
+        prism_dir = checkout
     claude_dir = home / ".claude"
     nvim_config = home / ".config/nvim"
+    pack_dir = home / ".local/share/nvim/site/pack/prism/start"
+    plugins_dir = nvim_config / "lua/plugins"
+    ensure_dirs(pack_dir, claude_dir, plugins_dir)
 
-    # Step 1: Clone/update repository
-    step("Installing prism.nvim...")
-    if prism_dir.exists():
-        info("Updating existing installation...")
-        run(f"cd {prism_dir} && git pull", check=False)
-    else:
-        info("Cloning prism.nvim...")
-        run(f"git clone https://github.com/genomewalker/prism.nvim.git {prism_dir}")
-
-    # Step 2: Python dependencies
-    step("Installing Python dependencies...")
-    run("python3 -m pip install --user --quiet msgpack", check=False)
-    info("msgpack installed")
+    # Steps 1 and 2 don't depend on each other: overlap the network-bound
+    # clone and pip install, then join before Step 3 links the checkout.
+    # Each task returns its log lines, printed in step order after the join.
+    if skip_git and not in_place and not prism_dir.exists():
+        error(f"{prism_dir} not found; run once without --offline/--skip-git")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        steps = []
+        if in_place:
+            steps.append(("Installing prism.nvim...", [f"Using checkout: {prism_dir}"]))
+        elif skip_git:
+            steps.append(("Installing prism.nvim...", ["Skipped repository update"]))
+        else:
+            steps.append(("Installing prism.nvim...", pool.submit(sync_repo, prism_dir)))
+        if skip_pip:
+            steps.append(("Installing Python dependencies...", ["Skipped Python dependencies"]))
+        else:
+            steps.append(("Installing Python dependencies...", pool.submit(install_deps)))
+        for title, msgs in steps:
+            step(title)
+            if isinstance(msgs, Future):
+                try:
+                    msgs = msgs.result()
+                except RuntimeError as e:
+                    error(str(e))
+            for msg in msgs:
+                info(msg)
 
     # Step 3: Neovim plugin
     step("Setting up Neovim plugin...")
-    pack_dir = home / ".local/share/nvim/site/pack/prism/start"
-    pack_dir.mkdir(parents=True, exist_ok=True)
     link_path = pack_dir / "prism.nvim"
-    if link_path.is_symlink():
-        link_path.unlink()
-    link_path.symlink_to(prism_dir)
-    info(f"Linked: {link_path}")
+    if link_path.is_symlink() and os.readlink(link_path) == str(prism_dir):
+        info(f"Already linked: {link_path}")
+    else:
+        # Build the new link beside the old one and rename it over, so a
+        # Neovim starting meanwhile never finds the plugin missing
+        tmp_link = link_path.with_name(link_path.name + ".new")
+        tmp_link.unlink(missing_ok=True)
+        os.symlink(prism_dir, tmp_link)
+        os.replace(tmp_link, link_path)
+        info(f"Linked: {link_path}")
 
     # Step 4: MCP server config
     step("Configuring Claude Code MCP...")
-    claude_dir.mkdir(exist_ok=True)
     settings_file = claude_dir / "settings.json"
 
-    settings = {}
-    if settings_file.exists():
-        try:
-            settings = json.loads(settings_file.read_text())
-        except:
-            pass
+    try:
+        raw = settings_file.read_bytes()
+    except FileNotFoundError:
+        raw = b"{}"
+    try:
+        settings = load_json(raw)
+    except ValueError:
+        # JSONDecodeError (either parser) or bytes that aren't UTF-8
+        settings = None
+    if not isinstance(settings, dict):
+        # Keep the user's broken file for inspection rather than clobbering it
+        backup = settings_file.with_suffix(".json.bak")
+        shutil.copy2(settings_file, backup)
+        warn(f"settings.json is not a valid JSON object; backed up to {backup}")
+        settings = {}
 
-    if "mcpServers" not in settings:
-        settings["mcpServers"] = {}
-
-    settings["mcpServers"]["prism-nvim"] = {
+    server = {
         "type": "stdio",
-        "command": "python3",
+        "command": PYTHON,
         "args": ["-m", "prism_nvim.mcp_server"],
         "cwd": str(prism_dir)
     }
 
-    settings_file.write_text(json.dumps(settings, indent=2))
-    info("MCP server registered")
+    if settings.get("mcpServers", {}).get("prism-nvim") == server:
+        info("MCP server already registered")
+    else:
+        settings.setdefault("mcpServers", {})["prism-nvim"] = server
+        safe_write(settings_file, dump_json(settings))
+        info("MCP server registered")
 
     # Step 5: CLAUDE.md instructions
     step("Adding Claude instructions...")
@@ -111,27 +457,51 @@ When connected to Neovim via prism.nvim, **prefer MCP tools over standard tools*
 **Check connection**: `mcp__prism-nvim__get_current_file`
 '''
 
-    if claude_md.exists():
+    # The block is fenced by markers so upgrades can swap it out; a sidecar
+    # holding its digest makes the up-to-date check independent of file size
+    block = f"{PRISM_BEGIN}{prism_instructions}{PRISM_END}\n"
+    digest = hashlib.sha256(block.encode()).hexdigest()
+    sidecar = claude_dir / ".prism_instructions.sha256"
+
+    if claude_md.exists() and sidecar.exists() and sidecar.read_text() == digest:
+        info("Prism instructions already in CLAUDE.md")
+    elif claude_md.exists():
         content = claude_md.read_text()
-        if "Prism.nvim MCP" not in content:
-            claude_md.write_text(content + prism_instructions)
-            info("Added Prism instructions to CLAUDE.md")
+        start = content.find(PRISM_BEGIN)
+        end = content.find(PRISM_END, start)
+        if start != -1 and end != -1:
+            # Replace the stale block in place
+            content = content[:start] + block + content[end + len(PRISM_END):].lstrip("\n")
+            info("Updated Prism instructions in CLAUDE.md")
         else:
-            info("Prism instructions already in CLAUDE.md")
+            content = strip_legacy_instructions(content).rstrip("\n")
+            content += "\n\n" + block
+            info("Added Prism instructions to CLAUDE.md")
+        safe_write(claude_md, content.encode())
+        safe_write(sidecar, digest.encode())
     else:
-        claude_md.write_text("# Claude Instructions\n" + prism_instructions)
+        safe_write(claude_md, ("# Claude Instructions\n\n" + block).encode())
+        safe_write(sidecar, digest.encode())
         info("Created CLAUDE.md with Prism instructions")
 
     # Step 6: Neovim config
     step("Creating Neovim config...")
-    plugins_dir = nvim_config / "lua/plugins"
-    plugins_dir.mkdir(parents=True, exist_ok=True)
     prism_config = plugins_dir / "prism.lua"
+    if in_place:
+        plugin_dir = lua_string(prism_dir)
+    else:
+        plugin_dir = b'vim.fn.expand("~/.local/share/prism.nvim")'
+    dir_line = b"  dir = " + plugin_dir + b","
+    config_header = b"-- Prism.nvim - Claude Code integration\n"
 
-    if not prism_config.exists():
-        prism_config.write_text('''-- Prism.nvim - Claude Code integration
-return {
-  dir = vim.fn.expand("~/.local/share/prism.nvim"),
+    try:
+        config = prism_config.read_bytes()
+    except FileNotFoundError:
+        config = None
+
+    if config is None:
+        safe_write(prism_config, config_header + b'''return {
+DIR_LINE
   lazy = false,
   config = function()
     require("prism.core").setup({
@@ -143,48 +513,27 @@ return {
     })
   end,
 }
-''')
+'''.replace(b"DIR_LINE", dir_line))
         info(f"Created: {prism_config}")
     else:
-        info("Neovim config already exists")
+        # Only follow a switch between the installed copy and a checkout:
+        # a dir line the user changed is left alone
+        updated = config
+        if config.startswith(config_header):
+            updated = GENERATED_DIR_LINE.sub(lambda _: dir_line, config, count=1)
+        if updated == config:
+            info("Neovim config already exists")
+        else:
+            safe_write(prism_config, updated)
+            info(f"Updated plugin dir in: {prism_config}")
 
-    # Step 7: Shell aliases
+    # Step 7: Shell aliases, only once the install itself has succeeded
     step("Adding shell aliases...")
-    shell_rc = home / ".zshrc" if (home / ".zshrc").exists() else home / ".bashrc"
-
-    if shell_rc.exists():
-        content = shell_rc.read_text()
-        if "CLAUDE_ARGS" not in content:
-            with open(shell_rc, "a") as f:
-                f.write('''
-# Prism.nvim helpers
-alias nvc='CLAUDE_ARGS="--continue" nvim'
-alias nvco='CLAUDE_ARGS="--model opus" nvim'
-alias nvcs='CLAUDE_ARGS="--model sonnet" nvim'
-''')
-            info(f"Added aliases to {shell_rc}")
-        else:
-            info("Shell aliases already configured")
+    for msg in add_aliases(home):
+        info(msg)
 
     # Done!
-    print()
-    print("  ╔═══════════════════════════════════════╗")
-    print("  ║        Installation Complete!         ║")
-    print("  ╚═══════════════════════════════════════╝")
-    print()
-    print("  Next steps:")
-    print()
-    print("    1. Restart Claude Code (to load MCP)")
-    print("    2. Open Neovim")
-    print("    3. Press Ctrl+; to toggle Claude")
-    print()
-    print("  Keybindings:")
-    print("    Ctrl+;           Toggle Claude terminal")
-    print("    Ctrl+\\ Ctrl+\\    Exit terminal mode")
-    print("    <leader>cs       Send to Claude")
-    print()
-    print("  Token savings: Claude now uses MCP for 10-50x fewer tokens!")
-    print()
+    sys.stdout.write(BANNER)
 
 if __name__ == "__main__":
     main()
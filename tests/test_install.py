@@ -0,0 +1,156 @@
+"""Tests for the skill installer's file writing."""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+INSTALL_PY = Path(__file__).resolve().parents[1] / "skills" / "prism" / "install.py"
+
+
+@pytest.fixture(scope="module")
+def install():
+    spec = importlib.util.spec_from_file_location("prism_install", INSTALL_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_safe_write_replaces_contents(install, tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_bytes(b"old")
+    install.safe_write(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["settings.json"]
+
+
+def test_safe_write_keeps_symlinks(install, tmp_path):
+    dotfiles = tmp_path / "dotfiles"
+    dotfiles.mkdir()
+    target = dotfiles / "CLAUDE.md"
+    target.write_bytes(b"old")
+    link = tmp_path / "CLAUDE.md"
+    link.symlink_to(target)
+
+    install.safe_write(link, b"new")
+
+    assert link.is_symlink()
+    assert link.resolve() == target
+    assert target.read_bytes() == b"new"
+    assert sorted(os.listdir(dotfiles)) == ["CLAUDE.md"]
+
+
+def test_safe_write_replaces_stale_tmp(install, tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_bytes(b"old")
+    (tmp_path / "settings.json.tmp").write_bytes(b"half-written")
+    install.safe_write(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["settings.json"]
+
+
+def test_failed_write_leaves_original_intact(install, tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    path.write_bytes(b"old")
+
+    def fail(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(install.os, "fsync", fail)
+    with pytest.raises(OSError, match="disk full"):
+        install.safe_write(path, b"new")
+
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["settings.json"]
+
+
+@pytest.mark.parametrize(
+    "path, literal",
+    [
+        ("/home/ana/prism.nvim", b"[[/home/ana/prism.nvim]]"),
+        ("/home/zoë/prism.nvim", "[[/home/zoë/prism.nvim]]".encode()),
+        ("/tmp/a]]b", b"[=[/tmp/a]]b]=]"),
+        ("/tmp/a]", b"[=[/tmp/a]]=]"),
+    ],
+)
+def test_lua_string(install, path, literal):
+    assert install.lua_string(Path(path)) == literal
+
+
+LEGACY_BLOCK = (
+    "# Prism.nvim MCP Integration\n\n"
+    "An older, since reworded table.\n\n"
+    "**Check connection**: `mcp__prism-nvim__get_current_file`\n"
+)
+
+
+def test_strip_legacy_instructions_keeps_what_follows(install):
+    content = (
+        "# Claude Instructions\n\n"
+        "Be terse.\n\n"
+        + LEGACY_BLOCK
+        + "\n## My subsection\n\nKeep me.\n\n"
+        "A plain paragraph, also kept.\n"
+    )
+    assert install.strip_legacy_instructions(content) == (
+        "# Claude Instructions\n\nBe terse.\n\n"
+        "\n## My subsection\n\nKeep me.\n\nA plain paragraph, also kept.\n"
+    )
+
+
+def test_strip_legacy_instructions_at_end_of_file(install):
+    content = "# Claude Instructions\n\n" + LEGACY_BLOCK
+    assert install.strip_legacy_instructions(content) == "# Claude Instructions\n\n"
+
+
+def test_strip_legacy_instructions_needs_the_whole_block(install):
+    content = "# Prism.nvim MCP Integration\n\nMy own notes, no closing line.\n"
+    assert install.strip_legacy_instructions(content) == content
+
+
+def test_standalone_copy_runs(tmp_path):
+    copy = tmp_path / "install.py"
+    copy.write_bytes(INSTALL_PY.read_bytes())
+    for cmd in ([sys.executable, str(copy), "--help"], [sys.executable, "-", "--help"]):
+        result = subprocess.run(
+            cmd, input=INSTALL_PY.read_bytes(), cwd=tmp_path, capture_output=True
+        )
+        assert result.returncode == 0, result.stderr
+
+
+def test_script_checkout_outside_a_checkout(install, tmp_path, monkeypatch):
+    monkeypatch.setitem(vars(install), "__file__", str(tmp_path / "install.py"))
+    assert install.script_checkout() is None
+    monkeypatch.setitem(vars(install), "__file__", "/install.py")
+    assert install.script_checkout() is None
+
+
+def test_script_checkout_inside_a_checkout(install):
+    assert install.script_checkout() == INSTALL_PY.parents[2]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b'  dir = vim.fn.expand("~/.local/share/prism.nvim"),',
+        b"  dir = [[/home/ana/src/prism.nvim]],",
+        b"  dir = [=[/tmp/a]]=],",
+    ],
+)
+def test_generated_dir_lines_are_recognised(install, line):
+    assert install.GENERATED_DIR_LINE.fullmatch(line)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b'  dir = "/home/ana/src/prism.nvim",',
+        b'  dir = vim.fn.expand("~/code/prism.nvim"),',
+        b"  dir = [[/a]=],",
+    ],
+)
+def test_customised_dir_lines_are_left_alone(install, line):
+    assert not install.GENERATED_DIR_LINE.fullmatch(line)
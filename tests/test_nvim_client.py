@@ -0,0 +1,198 @@
+"""Tests for NeovimClient against an in-process fake Neovim."""
+
+import socket
+import threading
+
+import msgpack
+import pytest
+
+from prism_nvim import nvim_client, socket_registry
+from prism_nvim.nvim_client import NeovimClient, _first_live_socket, _new_unpacker
+
+BUF = 5
+
+
+def _handle(code: int, value: int) -> msgpack.ExtType:
+    """Encode a handle the way Neovim does (EXT 0/1/2 wrapping an int)."""
+    return msgpack.ExtType(code, msgpack.packb(value))
+
+
+def _plain(value):
+    """Handle sent back by the client, as an int."""
+    if isinstance(value, msgpack.ExtType):
+        return msgpack.unpackb(value.data)
+    return value
+
+
+class FakeNvim(threading.Thread):
+    """Answers the few API calls the client makes, like Neovim would.
+
+    Commands that change buffer state also emit the prism_buf_changed
+    notification before their response, as the autocmds do.
+    """
+
+    def __init__(self, sock: socket.socket):
+        super().__init__(daemon=True)
+        self.sock = sock
+        self.options = {
+            BUF: {"buflisted": True, "filetype": "python", "modified": False, "channel": 3}
+        }
+        self.calls: list[str] = []
+        self.sent: list[tuple[int, str]] = []
+        self.dead_channels: set[int] = set()
+
+    def run(self):
+        unpacker = msgpack.Unpacker(raw=False)
+        while data := self.sock.recv(65536):
+            unpacker.feed(data)
+            for _, msgid, method, args in unpacker:
+                self.calls.append(method)
+                try:
+                    reply = [1, msgid, None, self.dispatch(method, args)]
+                except ValueError as e:
+                    reply = [1, msgid, [0, str(e)], None]
+                self.sock.sendall(msgpack.packb(reply))
+
+    def dispatch(self, method, args):
+        if method == "nvim_list_bufs":
+            return [_handle(0, BUF)]
+        if method == "nvim_buf_get_name":
+            return "/tmp/example.py"
+        if method == "nvim_buf_get_option":
+            return self.options[_plain(args[0])][args[1]]
+        if method == "nvim_chan_send":
+            if args[0] in self.dead_channels:
+                raise ValueError("Invalid channel id")
+            self.sent.append(tuple(args))
+            return None
+        if method == "nvim_command":
+            if args[0] == "setfiletype lua":
+                self.options[BUF]["filetype"] = "lua"
+            elif args[0] == "terminal":
+                self.options[BUF]["channel"] += 1
+            self.sock.sendall(msgpack.packb([2, "prism_buf_changed", [BUF]]))
+        return None
+
+
+@pytest.fixture
+def nvim():
+    ours, theirs = socket.socketpair()
+    server = FakeNvim(theirs)
+    server.start()
+    client = NeovimClient("unused")
+    client.socket = ours
+    client._connected = True
+    client._watching_buf_options = True
+    yield client, server
+    ours.close()
+    theirs.close()
+
+
+def test_handles_decode_to_ints():
+    unpacker = _new_unpacker()
+    unpacker.feed(msgpack.packb([1, 1, None, [_handle(0, 5), _handle(1, 1000), _handle(2, 1)]]))
+    assert next(unpacker)[3] == [5, 1000, 1]
+
+
+def test_buf_options_are_cached(nvim):
+    client, server = nvim
+    bufs = client.call("nvim_list_bufs")
+    assert client._get_buf_options(bufs, "filetype") == ["python"]
+    assert client._get_buf_options(bufs, "filetype") == ["python"]
+    assert server.calls.count("nvim_buf_get_option") == 1
+
+
+def test_notification_invalidates_buffer_from_list_bufs(nvim):
+    client, server = nvim
+    bufs = client.call("nvim_list_bufs")
+    assert client._get_buf_options(bufs, "filetype") == ["python"]
+
+    client.command("setfiletype lua")
+
+    assert client._get_buf_options(bufs, "filetype") == ["lua"]
+    assert server.calls.count("nvim_buf_get_option") == 2
+
+
+def test_buflisted_is_not_cached(nvim):
+    client, server = nvim
+    assert [b.id for b in client.get_buffers()] == [BUF]
+
+    # e.g. `setlocal nobuflisted` from a BufEnter autocmd: no OptionSet fires
+    server.options[BUF]["buflisted"] = False
+
+    assert client.get_buffers() == []
+
+
+def _listener(path) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.listen(8)
+    return sock
+
+
+def test_first_live_socket_keeps_candidate_order(tmp_path):
+    newer, older = tmp_path / "newer.sock", tmp_path / "older.sock"
+    with _listener(older), _listener(newer):
+        assert _first_live_socket([str(newer), str(older)]) == str(newer)
+        assert _first_live_socket([str(older), str(newer)]) == str(older)
+
+
+def test_first_live_socket_skips_stale_sockets(tmp_path):
+    stale, live = tmp_path / "stale.sock", tmp_path / "live.sock"
+    _listener(stale).close()
+    with _listener(live):
+        assert _first_live_socket([str(stale), str(live)]) == str(live)
+    assert _first_live_socket([str(stale)]) is None
+
+
+def test_send_to_terminal_sends_immediately(nvim):
+    client, server = nvim
+    client.send_to_terminal("ls\n", BUF)
+    client.send_to_terminal("pwd\n", BUF)
+    assert server.sent == [(3, "ls\n"), (3, "pwd\n")]
+
+
+def test_send_to_terminal_reports_failures(nvim):
+    client, server = nvim
+    server.dead_channels.add(3)
+    with pytest.raises(RuntimeError, match="Invalid channel id"):
+        client.send_to_terminal("ls\n", BUF)
+
+
+def test_new_terminal_job_invalidates_cached_channel(nvim):
+    client, server = nvim
+    client.send_to_terminal("ls\n", BUF)
+
+    client.command("terminal")
+    client.send_to_terminal("pwd\n", BUF)
+
+    assert server.sent == [(3, "ls\n"), (4, "pwd\n")]
+
+
+@pytest.mark.parametrize("alive", [True, False])
+def test_failed_fast_reconnect_closes_socket(tmp_path, monkeypatch, alive):
+    opened = []
+
+    class TrackedSocket(socket.socket):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(nvim_client.socket, "socket", TrackedSocket)
+    monkeypatch.setattr(socket_registry, "find_socket", lambda: None)
+    monkeypatch.setattr(NeovimClient, "_find_nvim_socket", lambda self: None)
+
+    path = tmp_path / "nvim.sock"
+    client = NeovimClient()
+    # Alive: the socket now belongs to another process; dead: nothing listens
+    client._verified = (str(path), 1)
+    listener = _listener(path) if alive else None
+    try:
+        with pytest.raises(ConnectionError):
+            client.connect()
+    finally:
+        if listener:
+            listener.close()
+
+    assert opened and all(s.fileno() == -1 for s in opened)
+    assert client.socket is None
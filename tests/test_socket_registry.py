@@ -0,0 +1,66 @@
+"""Tests for the socket registry's parse cache."""
+
+import json
+import os
+
+import pytest
+
+from prism_nvim import socket_registry
+
+
+@pytest.fixture
+def registry_path(tmp_path, monkeypatch):
+    path = tmp_path / "registry.json"
+    monkeypatch.setattr(socket_registry, "REGISTRY_PATH", path)
+    monkeypatch.setattr(socket_registry, "_registry_cache", None)
+    return path
+
+
+def _replace(path, registry, mtime_ns):
+    """Write registry the way every writer does (temp file + rename)."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(registry))
+    os.utime(tmp, ns=(mtime_ns, mtime_ns))
+    os.replace(tmp, path)
+
+
+def test_missing_registry_is_empty(registry_path):
+    assert socket_registry.load_registry() == {}
+
+
+def test_save_then_load_round_trips(registry_path):
+    socket_registry.save_registry({"1": {"socket": "/tmp/a.sock"}})
+    assert socket_registry.load_registry() == {"1": {"socket": "/tmp/a.sock"}}
+
+
+def test_callers_get_a_copy(registry_path):
+    socket_registry.save_registry({"1": {"socket": "/tmp/a.sock"}})
+    socket_registry.load_registry().pop("1")
+    assert "1" in socket_registry.load_registry()
+
+
+def test_same_size_rewrite_with_same_mtime_is_seen(registry_path):
+    mtime = 1_700_000_000_000_000_000
+    _replace(registry_path, {"1": {"socket": "/tmp/a.sock"}}, mtime)
+    assert socket_registry.load_registry() == {"1": {"socket": "/tmp/a.sock"}}
+
+    # Same size, same mtime: only the inode tells the files apart
+    _replace(registry_path, {"2": {"socket": "/tmp/b.sock"}}, mtime)
+    assert socket_registry.load_registry() == {"2": {"socket": "/tmp/b.sock"}}
+
+
+def test_save_caches_its_own_file_not_a_racing_writer(registry_path, monkeypatch):
+    real_replace = os.replace
+
+    def replace_then_race(src, dst):
+        real_replace(src, dst)
+        # Another writer renames its registry in right after ours
+        other = registry_path.with_name("other.tmp")
+        other.write_text(json.dumps({"2": {"socket": "/tmp/b.sock"}}))
+        real_replace(other, dst)
+
+    monkeypatch.setattr(socket_registry.os, "replace", replace_then_race)
+    socket_registry.save_registry({"1": {"socket": "/tmp/a.sock"}})
+    monkeypatch.setattr(socket_registry.os, "replace", real_replace)
+
+    assert socket_registry.load_registry() == {"2": {"socket": "/tmp/b.sock"}}